@@ -3,7 +3,8 @@ Data source management for collecting participants from various sources.
 """
 import threading
 import time
-from typing import Dict, Callable, Optional, Any
+from types import MappingProxyType
+from typing import Dict, Callable, Optional, Any, Mapping
 from datetime import datetime
 from models import Participant
 from youtube_api import YouTubeAPI
@@ -14,17 +15,37 @@ from url_extractor import YouTubeURLExtractor
 class DataSourceManager:
     """Manages data collection from live and offline sources."""
     
+    # Minimum seconds between live-fetch UI notifications (10 Hz cap)
+    NOTIFY_MIN_INTERVAL = 0.1
+    
+    # Live-fetch backoff caps in seconds (idle chat / consecutive errors)
+    MAX_IDLE_POLL_INTERVAL = 30
+    MAX_ERROR_BACKOFF = 60
+    
     def __init__(self):
         """Initialize the data source manager."""
         self.participants: Dict[str, Participant] = {}
+        # Held while participants (or the keyword they track) change, since
+        # imports, the live fetch and the UI run on different threads
+        self._participants_lock = threading.RLock()
         self.youtube_api: Optional[YouTubeAPI] = None
         self.url_extractor = YouTubeURLExtractor()
         self.file_parser = DataParser()
         
+        # Import state (imports may run on a background thread)
+        self.is_importing = False
+        
         # Live fetching state
         self.is_live_fetching = False
         self.live_thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        self._last_notify_ts = 0.0
+        self._pending_notify = False
+        self._idle_streak = 0
+        self._err_streak = 0
+        
+        # Keyword tracked on each participant (see Participant.set_keyword)
+        self.keyword = ""
         
         # Callbacks for UI updates
         self.on_participants_updated: Optional[Callable] = None
@@ -60,6 +81,22 @@ class DataSourceManager:
         """
         self.youtube_api = youtube_api
     
+    def set_keyword(self, keyword: str) -> None:
+        """
+        Set the keyword tracked on every participant.
+        
+        Args:
+            keyword: Keyword from the active filter, or empty string for none
+        """
+        keyword = keyword.strip()
+        if keyword == self.keyword:
+            return  # Participants already track it
+        
+        with self._participants_lock:
+            self.keyword = keyword
+            for participant in self.participants.values():
+                participant.set_keyword(keyword)
+    
     def import_from_file(self, file_path: str) -> bool:
         """
         Import participants from a file.
@@ -70,6 +107,7 @@ class DataSourceManager:
         Returns:
             True if import successful, False otherwise
         """
+        self.is_importing = True
         try:
             self._notify_status("Importing participants from file...")
             
@@ -81,18 +119,7 @@ class DataSourceManager:
                 return False
             
             # Merge with existing participants
-            original_count = len(self.participants)
-            for username_key, participant in new_participants.items():
-                if username_key in self.participants:
-                    # Merge messages from existing participant
-                    existing = self.participants[username_key]
-                    for message in participant.messages:
-                        existing.add_message(message)
-                else:
-                    # Add new participant
-                    self.participants[username_key] = participant
-            
-            new_count = len(self.participants)
+            new_count = self._merge_participants(new_participants)
             imported_count = len(new_participants)
             
             self._notify_status(f"Imported {imported_count} participants from file. Total: {new_count}")
@@ -104,6 +131,8 @@ class DataSourceManager:
             error_msg = f"Error importing file: {str(e)}"
             self._notify_error(error_msg)
             return False
+        finally:
+            self.is_importing = False
     
     def import_from_url(self, url: str, demo_mode: bool = True) -> bool:
         """
@@ -116,6 +145,7 @@ class DataSourceManager:
         Returns:
             True if import successful, False otherwise
         """
+        self.is_importing = True
         try:
             self._notify_status("Processing YouTube URL...")
             
@@ -146,18 +176,7 @@ class DataSourceManager:
                 self._notify_status("URL-only mode: Generated sample participants")
             
             # Merge with existing participants
-            original_count = len(self.participants)
-            for username_key, participant in new_participants.items():
-                if username_key in self.participants:
-                    # Merge messages from existing participant
-                    existing = self.participants[username_key]
-                    for message in participant.messages:
-                        existing.add_message(message)
-                else:
-                    # Add new participant
-                    self.participants[username_key] = participant
-            
-            new_count = len(self.participants)
+            new_count = self._merge_participants(new_participants)
             imported_count = len(new_participants)
             
             self._notify_status(f"Imported {imported_count} participants from URL. Total: {new_count}")
@@ -169,6 +188,8 @@ class DataSourceManager:
             error_msg = f"Error importing from URL: {str(e)}"
             self._notify_error(error_msg)
             return False
+        finally:
+            self.is_importing = False
     
     def start_live_fetch(self, video_url_or_id: str) -> bool:
         """
@@ -222,84 +243,154 @@ class DataSourceManager:
         if self.live_thread and self.live_thread.is_alive():
             self.live_thread.join(timeout=5)
         
+        self._flush_notify(force=True)
         self._notify_status("Live fetch stopped")
     
     def _live_fetch_loop(self) -> None:
         """Main loop for live fetching (runs in separate thread)."""
-        consecutive_errors = 0
+        self._idle_streak = 0
+        self._err_streak = 0
         max_consecutive_errors = 5
         
         while not self.stop_event.is_set():
+            # Sleep out the rest of the API's polling interval instead of
+            # getting a throttled empty result back (which would count as idle)
+            if self.stop_event.wait(self.youtube_api.get_next_poll_delay()):
+                break
+            
             try:
                 # Fetch new messages
                 success, messages, error_msg = self.youtube_api.fetch_live_chat_messages()
+                poll_interval = self.youtube_api.get_polling_interval()
                 
                 if success:
+                    self._err_streak = 0
+                    
                     if messages:  # Only update if we got new messages
                         # Process messages
-                        new_message_count = self.youtube_api.process_chat_messages(
-                            messages, self.participants
-                        )
+                        with self._participants_lock:
+                            new_message_count = self.youtube_api.process_chat_messages(
+                                messages, self.participants, self.keyword
+                            )
                         
                         if new_message_count > 0:
                             self.total_messages_fetched += new_message_count
                             self.last_fetch_time = datetime.now()
                             
-                            # Notify UI of updates
-                            self._notify_participants_updated()
-                            self._notify_status(
-                                f"Live fetching... {len(self.participants)} participants, "
-                                f"{self.total_messages_fetched} messages"
-                            )
-                    
-                    consecutive_errors = 0
+                            # Notify UI of updates (coalesced under burst load)
+                            self._schedule_notify()
+                        
+                        # Chat is active, poll again at the API's interval
+                        self._idle_streak = 0
+                        delay = poll_interval
+                    else:
+                        self._flush_notify()
+                        delay = self._idle_delay(poll_interval)
+                        self._idle_streak += 1
                     
                 elif error_msg:
                     # Handle error
                     self.fetch_errors += 1
-                    consecutive_errors += 1
+                    self._err_streak += 1
                     
-                    if consecutive_errors >= max_consecutive_errors:
+                    if self._err_streak >= max_consecutive_errors:
+                        self._flush_notify(force=True)
                         self._notify_error(f"Too many consecutive errors. Stopping: {error_msg}")
                         break
                     else:
-                        self._notify_error(f"Fetch error (attempt {consecutive_errors}): {error_msg}")
-                
-                # Wait for next poll (respect API polling interval)
-                poll_interval = self.youtube_api.get_polling_interval()
-                self.stop_event.wait(poll_interval)
+                        self._notify_error(f"Fetch error (attempt {self._err_streak}): {error_msg}")
+                    
+                    delay = self._error_delay()
+                else:
+                    delay = poll_interval
                 
             except Exception as e:
                 self.fetch_errors += 1
-                consecutive_errors += 1
+                self._err_streak += 1
                 error_msg = f"Unexpected error in live fetch: {str(e)}"
                 
-                if consecutive_errors >= max_consecutive_errors:
+                if self._err_streak >= max_consecutive_errors:
+                    self._flush_notify(force=True)
                     self._notify_error(f"Too many errors. Stopping: {error_msg}")
                     break
                 else:
                     self._notify_error(error_msg)
                 
-                # Wait before retrying
-                self.stop_event.wait(5)
+                delay = self._error_delay()
+            
+            self._wait_for_next_poll(delay)
         
         # Clean up
         self.is_live_fetching = False
         if self.youtube_api:
             self.youtube_api.reset_chat_session()
     
+    def _wait_for_next_poll(self, delay: float) -> None:
+        """
+        Sleep until the next poll, waking immediately if stop_event is set.
+        
+        A notification held back by NOTIFY_MIN_INTERVAL is sent as soon as
+        the interval has passed, if that comes before the next poll.
+        
+        Args:
+            delay: Seconds until the next poll
+        """
+        if self._pending_notify:
+            remaining = self.NOTIFY_MIN_INTERVAL - (time.monotonic() - self._last_notify_ts)
+            wait = min(max(remaining, 0), delay)
+            if wait > 0:
+                if self.stop_event.wait(wait):
+                    return
+                delay -= wait
+            # A poll due before the interval is up leaves the update pending for it
+            if wait >= remaining:
+                self._flush_notify(force=True)
+        
+        self.stop_event.wait(delay)
+    
+    def _idle_delay(self, poll_interval: float) -> float:
+        """
+        Get the wait before the next poll after an empty fetch.
+        
+        Grows by half the polling interval per consecutive empty fetch,
+        capped at MAX_IDLE_POLL_INTERVAL (never below the API's interval).
+        
+        Args:
+            poll_interval: Polling interval requested by the API
+            
+        Returns:
+            Delay in seconds
+        """
+        backoff = poll_interval * (1 + self._idle_streak * 0.5)
+        return max(poll_interval, min(backoff, self.MAX_IDLE_POLL_INTERVAL))
+    
+    def _error_delay(self) -> float:
+        """Get the exponential backoff delay after a failed fetch."""
+        return min(2 ** self._err_streak, self.MAX_ERROR_BACKOFF)
+    
     def clear_participants(self) -> None:
         """Clear all participants."""
-        self.participants.clear()
+        with self._participants_lock:
+            self.participants.clear()
         self.total_messages_fetched = 0
         self.last_fetch_time = None
         self.fetch_errors = 0
         self._notify_participants_updated()
         self._notify_status("Participants cleared")
     
-    def get_participants(self) -> Dict[str, Participant]:
-        """Get current participants dictionary."""
-        return self.participants.copy()
+    def get_participants(self) -> Mapping[str, Participant]:
+        """
+        Get a read-only live view of the participants dictionary.
+        
+        The view changes as imports and the live fetch add participants, so
+        callers on other threads should iterate snapshot_participants() instead.
+        """
+        return MappingProxyType(self.participants)
+    
+    def snapshot_participants(self) -> Dict[str, Participant]:
+        """Get a copy of the participants dictionary that won't change underneath the caller."""
+        with self._participants_lock:
+            return self.participants.copy()
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -317,6 +408,58 @@ class DataSourceManager:
             'youtube_api_connected': self.youtube_api and self.youtube_api.is_authenticated()
         }
     
+    def _merge_participants(self, new_participants: Dict[str, Participant]) -> int:
+        """
+        Merge imported participants into the participants dictionary.
+        
+        Args:
+            new_participants: Parsed participants keyed by normalized username
+            
+        Returns:
+            Total number of participants after the merge
+        """
+        with self._participants_lock:
+            participants = self.participants
+            keyword = self.keyword
+            for username_key, participant in new_participants.items():
+                existing = participants.get(username_key)
+                if existing is not None:
+                    # Merge messages from existing participant (keeps its keyword tracking current)
+                    existing.extend_messages(participant.messages)
+                else:
+                    # Add new participant, tracking the current keyword from the start
+                    participant.set_keyword(keyword)
+                    participants[username_key] = participant
+            
+            return len(participants)
+    
+    def _schedule_notify(self) -> None:
+        """Mark live updates as pending and notify if the rate limit allows."""
+        self._pending_notify = True
+        self._flush_notify()
+    
+    def _flush_notify(self, force: bool = False) -> None:
+        """
+        Send pending live-fetch notifications as a single update.
+        
+        Args:
+            force: Send immediately, ignoring NOTIFY_MIN_INTERVAL
+        """
+        if not self._pending_notify:
+            return
+        
+        now = time.monotonic()
+        if not force and now - self._last_notify_ts < self.NOTIFY_MIN_INTERVAL:
+            return  # Leave pending for a later iteration
+        
+        self._pending_notify = False
+        self._last_notify_ts = now
+        self._notify_participants_updated()
+        self._notify_status(
+            f"Live fetching... {len(self.participants)} participants, "
+            f"{self.total_messages_fetched} messages"
+        )
+    
     def _notify_participants_updated(self) -> None:
         """Notify that participants have been updated."""
         if self.on_participants_updated:
@@ -350,4 +493,5 @@ class DataSourceManager:
     def cleanup(self) -> None:
         """Clean up resources."""
         self.stop_live_fetch()
-        self.participants.clear()
+        with self._participants_lock:
+            self.participants.clear()
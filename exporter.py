@@ -2,10 +2,22 @@
 CSV export functionality for participants and winners.
 """
 import csv
+import os
+import queue
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Iterable
 from datetime import datetime
 from models import Participant, Winner, GiveawaySession
+from filters import ParticipantFilter
+
+# Large write buffer so csv.writer.writerows drains rows with few write() syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Rows are formatted on the calling thread and handed to a writer thread in chunks
+EXPORT_CHUNK_ROWS = 512
+EXPORT_QUEUE_CHUNKS = 16
 
 
 class DataExporter:
@@ -29,11 +41,13 @@ class DataExporter:
             True if export successful, False otherwise
         """
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Write header
-                headers = [
+            video_id = session.youtube_video_id if session else ''
+            mode = session.mode if session else 'unknown'
+            now_iso = datetime.now().isoformat()  # Fallback for winners without a timestamp
+            
+            def rows():
+                # Header
+                yield [
                     'timestamp_iso',
                     'youtube_video_id',
                     'mode',
@@ -41,19 +55,19 @@ class DataExporter:
                     'draw_order',
                     'selected_as_winner'
                 ]
-                writer.writerow(headers)
                 
-                # Write winner data
+                # Winner data
                 for winner in winners:
-                    row = [
-                        winner.timestamp.isoformat() if winner.timestamp else datetime.now().isoformat(),
-                        session.youtube_video_id if session else '',
-                        session.mode if session else 'unknown',
+                    yield [
+                        winner.timestamp.isoformat() if winner.timestamp else now_iso,
+                        video_id,
+                        mode,
                         winner.username,
                         winner.draw_order,
                         True
                     ]
-                    writer.writerow(row)
+            
+            self._write_rows(file_path, rows())
             
             return True
         except Exception as e:
@@ -64,7 +78,8 @@ class DataExporter:
                                winners: List[Winner], file_path: str,
                                session: GiveawaySession = None,
                                eligible_usernames: List[str] = None,
-                               filter_summary: Dict = None) -> bool:
+                               filter_summary: Dict = None,
+                               participant_filter: ParticipantFilter = None) -> bool:
         """
         Export all participants to CSV file with detailed information.
         
@@ -75,21 +90,33 @@ class DataExporter:
             session: Optional session data
             eligible_usernames: List of usernames that passed filters
             filter_summary: Summary of applied filters
+            participant_filter: Filter whose keyword and blacklist decide the
+                keyword_used and blacklisted columns (built from filter_summary
+                if not given)
             
         Returns:
             True if export successful, False otherwise
         """
         try:
             # Create sets for faster lookup
-            winner_usernames = {winner.username.lower() for winner in winners}
-            winner_draw_order = {winner.username.lower(): winner.draw_order for winner in winners}
+            winner_draw_order = {winner.username_key: winner.draw_order for winner in winners}
+            winner_usernames = winner_draw_order.keys()
             eligible_set = set(eligible_usernames) if eligible_usernames else set()
             
-            with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Write header
-                headers = [
+            # Get filter info for keyword detection (same match as the filter itself)
+            if participant_filter is None:
+                participant_filter = self._filter_from_summary(filter_summary)
+            keyword_re = participant_filter.keyword_pattern
+            blacklisted_users = participant_filter.blacklist  # Already a set of normalized names
+            
+            # Session columns are the same for every row
+            timestamp_iso = session.timestamp_created.isoformat() if session and session.timestamp_created else datetime.now().isoformat()
+            video_id = session.youtube_video_id if session else ''
+            mode = session.mode if session else 'unknown'
+            
+            def rows():
+                # Header
+                yield [
                     'timestamp_iso',
                     'youtube_video_id',
                     'mode',
@@ -102,52 +129,54 @@ class DataExporter:
                     'selected_as_winner',
                     'draw_order'
                 ]
-                writer.writerow(headers)
                 
-                # Get filter info for keyword detection
-                keyword = filter_summary.get('keyword', '') if filter_summary else ''
-                blacklisted_users = set(filter_summary.get('blacklisted_users', [])) if filter_summary else set()
-                
-                # Write participant data
+                # Participant data
                 for username_key, participant in participants.items():
                     # Check if participant has keyword in messages
-                    has_keyword = False
-                    if keyword:
-                        for message in participant.messages:
-                            if keyword.lower() in message.lower():
-                                has_keyword = True
-                                break
-                    
-                    # Check if blacklisted
-                    is_blacklisted = username_key in blacklisted_users
-                    
-                    # Check if eligible
-                    is_eligible = username_key in eligible_set
+                    has_keyword = keyword_re is not None and keyword_re.search(participant.joined_messages) is not None
                     
                     # Check if winner
                     is_winner = username_key in winner_usernames
-                    draw_order = winner_draw_order.get(username_key, '') if is_winner else ''
                     
-                    row = [
-                        session.timestamp_created.isoformat() if session and session.timestamp_created else datetime.now().isoformat(),
-                        session.youtube_video_id if session else '',
-                        session.mode if session else 'unknown',
+                    yield [
+                        timestamp_iso,
+                        video_id,
+                        mode,
                         participant.username,
                         participant.message_count,
-                        participant.first_seen.isoformat() if participant.first_seen else '',
+                        participant.first_seen.isoformat() if participant.first_seen_ns else '',
                         has_keyword,
-                        is_blacklisted,
-                        is_eligible,
+                        username_key in blacklisted_users,
+                        username_key in eligible_set,
                         is_winner,
-                        draw_order
+                        winner_draw_order.get(username_key, '') if is_winner else ''
                     ]
-                    writer.writerow(row)
+            
+            self._write_rows(file_path, rows())
             
             return True
         except Exception as e:
             print(f"Error exporting participants: {e}")
             return False
     
+    @staticmethod
+    def _filter_from_summary(filter_summary: Dict = None) -> ParticipantFilter:
+        """
+        Rebuild a filter's keyword and blacklist from its get_filter_summary() output.
+        
+        Args:
+            filter_summary: Summary of applied filters, or None
+            
+        Returns:
+            ParticipantFilter with the summary's keyword, case sensitivity and blacklist
+        """
+        participant_filter = ParticipantFilter()
+        if filter_summary:
+            participant_filter.set_keyword_filter(filter_summary.get('keyword', ''),
+                                                  filter_summary.get('case_sensitive', False))
+            participant_filter.set_blacklist(filter_summary.get('blacklisted_users', []))
+        return participant_filter
+    
     def export_session(self, session: GiveawaySession, file_path: str) -> bool:
         """
         Export complete session data to CSV file.
@@ -160,50 +189,96 @@ class DataExporter:
             True if export successful, False otherwise
         """
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Write session metadata header
-                writer.writerow(['# Session Metadata'])
-                writer.writerow(['timestamp_created', session.timestamp_created.isoformat()])
-                writer.writerow(['youtube_video_id', session.youtube_video_id or ''])
-                writer.writerow(['mode', session.mode])
-                writer.writerow(['total_participants', len(session.participants)])
-                writer.writerow(['total_winners', len(session.winners)])
-                writer.writerow(['filters_applied', str(session.filters_applied)])
-                writer.writerow([])  # Empty row
-                
-                # Write participants header
-                writer.writerow(['# Participants'])
-                headers = [
+            # Create winner lookup
+            winner_data = {w.username_key: w for w in session.winners}
+            
+            # Session metadata and participants header, built once
+            header_rows = [
+                ('# Session Metadata',),
+                ('timestamp_created', session.timestamp_created.isoformat()),
+                ('youtube_video_id', session.youtube_video_id or ''),
+                ('mode', session.mode),
+                ('total_participants', len(session.participants)),
+                ('total_winners', len(session.winners)),
+                ('filters_applied', str(session.filters_applied)),
+                (),  # Empty row
+                ('# Participants',),
+                (
                     'username',
                     'message_count',
                     'first_seen',
                     'selected_as_winner',
                     'draw_order'
-                ]
-                writer.writerow(headers)
-                
-                # Create winner lookup
-                winner_data = {w.username.lower(): w for w in session.winners}
+                ),
+            ]
+            
+            def rows():
+                yield from header_rows
                 
-                # Write participant data
+                # Participant data
                 for username_key, participant in session.participants.items():
                     winner = winner_data.get(username_key)
-                    row = [
+                    yield [
                         participant.username,
                         participant.message_count,
-                        participant.first_seen.isoformat() if participant.first_seen else '',
+                        participant.first_seen.isoformat() if participant.first_seen_ns else '',
                         bool(winner),
                         winner.draw_order if winner else ''
                     ]
-                    writer.writerow(row)
+            
+            self._write_rows(file_path, rows())
             
             return True
         except Exception as e:
             print(f"Error exporting session: {e}")
             return False
     
+    def _write_rows(self, file_path: str, rows: Iterable[list]) -> None:
+        """
+        Write CSV rows to a file, overlapping row formatting with disk writes.
+        
+        The calling thread pulls rows from the iterable and queues them in
+        chunks; a single writer thread drains the queue into csv.writer.
+        
+        Args:
+            file_path: Path where to save the CSV file
+            rows: Iterable of rows (header included)
+            
+        Raises:
+            Exception: Any error raised while producing or writing rows
+        """
+        chunks = queue.Queue(maxsize=EXPORT_QUEUE_CHUNKS)
+        errors = []
+        
+        def consume(file):
+            writer = csv.writer(file)
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    return
+                if not errors:  # Keep draining after a failure so the producer never blocks
+                    try:
+                        writer.writerows(chunk)
+                    except Exception as e:
+                        errors.append(e)
+        
+        with open(file_path, 'w', newline='', encoding='utf-8',
+                  buffering=WRITE_BUFFER_SIZE) as file:
+            consumer = threading.Thread(target=consume, args=(file,), daemon=True)
+            consumer.start()
+            try:
+                rows = iter(rows)
+                for chunk in iter(lambda: list(islice(rows, EXPORT_CHUNK_ROWS)), []):
+                    if errors:
+                        break
+                    chunks.put(chunk)
+            finally:
+                chunks.put(None)
+                consumer.join()
+        
+        if errors:
+            raise errors[0]
+    
     def create_export_filename(self, base_name: str, export_type: str = "participants") -> str:
         """
         Create a timestamped filename for exports.
@@ -235,14 +310,11 @@ class DataExporter:
             if not path.parent.exists():
                 return False, f"Directory does not exist: {path.parent}"
             
-            # Try to create a test file
-            test_path = path.parent / f"test_write_{datetime.now().timestamp()}.tmp"
-            try:
-                test_path.touch()
-                test_path.unlink()  # Delete test file
-                return True, "Path is valid and writable"
-            except PermissionError:
+            # Check write permission without touching the filesystem
+            if not os.access(str(path.parent), os.W_OK):
                 return False, f"No write permission for directory: {path.parent}"
             
+            return True, "Path is valid and writable"
+            
         except Exception as e:
             return False, f"Invalid path: {str(e)}"
@@ -2,16 +2,27 @@
 Data parser for importing participant data from various file formats.
 """
 import csv
-import re
+import os
+import sys
+import time
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime
-from models import Participant
+from typing import Dict, List, Tuple, Optional, Iterator
+from models import Participant, normalize_username
+
+# Read buffer for chat logs (fewer read() syscalls on multi-MB exports)
+READ_BUFFER_SIZE = 1 << 20
+
+# CSV files at least this big are parsed with pandas when it is installed
+PANDAS_MIN_FILE_SIZE = 5 * 1024 * 1024
 
 
 class DataParser:
     """Handles parsing of participant data from files."""
     
+    # Chat line separators, tried in order ("username: message", "username - message", ...)
+    _LINE_SEPARATORS = (':', '-', '|', '>')
+    
     def __init__(self):
         """Initialize the parser."""
         self.supported_extensions = {'.txt', '.csv'}
@@ -61,34 +72,45 @@ class DataParser:
             Dictionary mapping username to Participant objects
         """
         participants = {}
+        messages_by_key = {}  # Buffered per user, added in one extend_messages call
+        start_ns = time.time_ns()  # Shared first_seen for this import
         
-        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+        with open(file_path, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER_SIZE) as file:
             # Use standard CSV reader
             reader = csv.reader(file)
             
-            # Read first row to check for headers
-            first_row = next(reader)
-            file.seek(0)  # Reset file position
-            reader = csv.reader(file)
+            # Read first row once to check for headers
+            first_row = next(reader, None)
+            if first_row is None:
+                return participants  # Empty file
             
             # Check if first row looks like headers
             has_header = any(col.lower() in ['author', 'username', 'user', 'name', 'text', 'message', 'content'] 
                            for col in first_row)
             
             if has_header:
-                headers = next(reader)
+                header_index = self._index_headers(first_row)
                 # Find author and text columns (case-insensitive)
-                author_col = self._find_column_index(headers, ['author', 'username', 'user', 'name'])
-                text_col = self._find_column_index(headers, ['text', 'message', 'content', 'msg'])
+                author_col = self._find_column_index(header_index, ['author', 'username', 'user', 'name'])
+                text_col = self._find_column_index(header_index, ['text', 'message', 'content', 'msg'])
                 
                 if author_col is None or text_col is None:
                     raise ValueError("CSV must contain 'author' and 'text' columns (or similar)")
+                rows = reader
             else:
-                # Assume first column is author, second is text
+                # Assume first column is author, second is text; first row is data
                 author_col = 0
                 text_col = 1
+                rows = chain([first_row], reader)
             
-            for row_num, row in enumerate(reader, start=2 if has_header else 1):
+            # Very large files: let pandas' C parser do the row loop if available
+            if os.path.getsize(file_path) >= PANDAS_MIN_FILE_SIZE:
+                try:
+                    return self._parse_csv_pandas(file_path, author_col, text_col, has_header)
+                except Exception:
+                    pass  # pandas missing or file it can't handle; use the csv module
+            
+            for row in rows:
                 if len(row) < max(author_col + 1, text_col + 1):
                     continue  # Skip incomplete rows
                 
@@ -99,15 +121,66 @@ class DataParser:
                     continue  # Skip empty entries
                 
                 # Normalize username (case-insensitive deduplication)
-                username_key = username.lower()
+                username_key = normalize_username(username)
                 
-                if username_key not in participants:
+                messages = messages_by_key.get(username_key)
+                if messages is None:
                     participants[username_key] = Participant(
                         username=username,  # Keep original case
-                        first_seen=datetime.now()
+                        first_seen_ns=start_ns
                     )
+                    messages = messages_by_key[username_key] = []
                 
-                participants[username_key].add_message(message)
+                messages.append(message)
+        
+        for username_key, messages in messages_by_key.items():
+            participants[username_key].extend_messages(messages)
+        
+        return participants
+    
+    def _parse_csv_pandas(self, file_path: str, author_col: int, text_col: int,
+                          has_header: bool) -> Dict[str, Participant]:
+        """
+        Parse a CSV file with pandas (optional dependency).
+        
+        Produces the same participants as the csv-module path in _parse_csv.
+        
+        Args:
+            file_path: Path to CSV file
+            author_col: Index of the author column
+            text_col: Index of the text column
+            has_header: Whether the first row is a header
+            
+        Returns:
+            Dictionary mapping username to Participant objects
+            
+        Raises:
+            ImportError: If pandas is not installed
+        """
+        import pandas as pd
+        
+        df = pd.read_csv(file_path, header=None, skiprows=1 if has_header else 0,
+                         usecols=[author_col, text_col], dtype=str, na_filter=False,
+                         encoding='utf-8', engine='c')
+        
+        # Short rows come back as NaN; treat them like empty entries and skip
+        authors = df[author_col].fillna('').str.strip()
+        texts = df[text_col].fillna('').str.strip()
+        keep = (authors != '') & (texts != '')
+        
+        rows = pd.DataFrame({'author': authors[keep], 'text': texts[keep]})
+        rows['key'] = rows['author'].str.casefold()
+        grouped = rows.groupby('key', sort=False).agg(
+            username=('author', 'first'),  # Keep original case of first occurrence
+            messages=('text', list)
+        )
+        
+        participants = {}
+        start_ns = time.time_ns()  # Shared first_seen for this import
+        for username_key, username, messages in zip(grouped.index, grouped['username'], grouped['messages']):
+            participant = Participant(username=username, first_seen_ns=start_ns)
+            participant.extend_messages(messages)
+            participants[sys.intern(username_key)] = participant
         
         return participants
     
@@ -128,31 +201,65 @@ class DataParser:
             Dictionary mapping username to Participant objects
         """
         participants = {}
+        messages_by_key = {}  # Buffered per user, added in one extend_messages call
+        start_ns = time.time_ns()  # Shared first_seen for this import
         
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
-                line = line.strip()
-                if not line:
-                    continue  # Skip empty lines
-                
-                username, message = self._parse_chat_line(line)
-                
-                if not username:
-                    continue  # Skip lines we couldn't parse
-                
-                # Normalize username (case-insensitive deduplication)
-                username_key = username.lower()
-                
-                if username_key not in participants:
-                    participants[username_key] = Participant(
-                        username=username,  # Keep original case
-                        first_seen=datetime.now()
-                    )
-                
-                participants[username_key].add_message(message or line)
+        # Read raw bytes so blank lines are skipped without being decoded
+        for raw_line in self._iter_raw_lines(file_path):
+            if not raw_line.strip():
+                continue  # Skip empty lines
+            
+            line = raw_line.decode('utf-8').strip()
+            if not line:
+                continue  # Only Unicode whitespace
+            
+            username, message = self._parse_chat_line(line)
+            
+            if not username:
+                continue  # Skip lines we couldn't parse
+            
+            # Normalize username (case-insensitive deduplication)
+            username_key = normalize_username(username)
+            
+            messages = messages_by_key.get(username_key)
+            if messages is None:
+                participants[username_key] = Participant(
+                    username=username,  # Keep original case
+                    first_seen_ns=start_ns
+                )
+                messages = messages_by_key[username_key] = []
+            
+            messages.append(message or line)
+        
+        for username_key, messages in messages_by_key.items():
+            participants[username_key].extend_messages(messages)
         
         return participants
     
+    def _iter_raw_lines(self, file_path: str) -> Iterator[bytes]:
+        """
+        Iterate over the raw lines of a file.
+        
+        Lines end at \\n, \\r\\n or a bare \\r, like text mode's universal
+        newlines (binary file iteration would only split on \\n).
+        
+        Args:
+            file_path: Path to the file
+            
+        Yields:
+            Each line as bytes, including its line ending
+        """
+        with open(file_path, 'rb', buffering=0) as file:
+            rest = b''
+            for block in iter(lambda: file.read(READ_BUFFER_SIZE), b''):
+                lines = (rest + block).splitlines(keepends=True)
+                # The last line may continue in the next block (even a \r
+                # could be the first half of \r\n), so carry it over
+                rest = lines.pop()
+                yield from lines
+            if rest:
+                yield rest
+    
     def _parse_chat_line(self, line: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Parse a single chat line to extract username and message.
@@ -163,41 +270,50 @@ class DataParser:
         Returns:
             Tuple of (username, message) or (username, None) if no separator found
         """
-        # Try different separator patterns
-        patterns = [
-            r'^([^:]+):\s*(.+)$',    # username: message
-            r'^([^-]+)-\s*(.+)$',    # username - message
-            r'^([^|]+)\|\s*(.+)$',   # username | message
-            r'^([^>]+)>\s*(.+)$',    # username > message
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, line)
-            if match:
-                username = match.group(1).strip()
-                message = match.group(2).strip()
+        # Split on the first occurrence of each separator in priority order;
+        # both the username and message parts must be non-empty
+        last = len(line) - 1
+        for separator in self._LINE_SEPARATORS:
+            idx = line.find(separator)
+            if 0 < idx < last:
+                username = line[:idx].strip()
+                message = line[idx + 1:].strip()
                 return username, message
         
         # If no separator found, treat entire line as username
         # This handles cases where file just contains usernames
         return line.strip(), None
     
-    def _find_column_index(self, headers: List[str], possible_names: List[str]) -> Optional[int]:
+    def _index_headers(self, headers: List[str]) -> Dict[str, int]:
         """
-        Find the index of a column with one of the possible names (case-insensitive).
+        Map lowercased column headers to their indices.
         
         Args:
             headers: List of column headers
+            
+        Returns:
+            Dictionary mapping lowercase header to index (first occurrence wins)
+        """
+        header_index = {}
+        for i, header in enumerate(headers):
+            header_index.setdefault(header.lower(), i)
+        return header_index
+    
+    def _find_column_index(self, header_index: Dict[str, int], possible_names: List[str]) -> Optional[int]:
+        """
+        Find the index of a column with one of the possible names (case-insensitive).
+        
+        Args:
+            header_index: Header lookup built by _index_headers
             possible_names: List of possible column names to look for
             
         Returns:
             Index of the matching column, or None if not found
         """
-        headers_lower = [h.lower() for h in headers]
-        
         for name in possible_names:
-            if name.lower() in headers_lower:
-                return headers_lower.index(name.lower())
+            index = header_index.get(name.lower())
+            if index is not None:
+                return index
         
         return None
     
@@ -1,19 +1,27 @@
 """
 Filtering logic for participants based on various criteria.
 """
-from typing import List, Dict, Set, Any
-from models import Participant
+import re
+from typing import List, Dict, Set, Any, Iterable, Optional, Pattern
+from models import Participant, normalize_username
 
 
 class ParticipantFilter:
     """Handles filtering of participants based on various criteria."""
     
+    # Bit flags returned by _evaluate for each failed criterion
+    REASON_BLACKLISTED = 1
+    REASON_TOO_FEW_MESSAGES = 2
+    REASON_NO_KEYWORD = 4
+    
     def __init__(self):
         """Initialize the filter with default settings."""
         self.keyword: str = ""
         self.min_messages: int = 1
         self.blacklist: Set[str] = set()
         self.case_sensitive: bool = False
+        self._keyword_re: Optional[Pattern] = None
+        self._summary_cache: Optional[Dict[str, Any]] = None
     
     def set_keyword_filter(self, keyword: str, case_sensitive: bool = False) -> None:
         """
@@ -25,6 +33,19 @@ class ParticipantFilter:
         """
         self.keyword = keyword.strip()
         self.case_sensitive = case_sensitive
+        self._summary_cache = None
+        
+        # Compile once so each participant is checked with a single regex scan
+        if self.keyword:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            self._keyword_re = re.compile(re.escape(self.keyword), flags)
+        else:
+            self._keyword_re = None
+    
+    @property
+    def keyword_pattern(self) -> Optional[Pattern]:
+        """Compiled keyword regex (honours case_sensitive), or None if no keyword is set."""
+        return self._keyword_re
     
     def set_minimum_messages(self, min_count: int) -> None:
         """
@@ -34,16 +55,22 @@ class ParticipantFilter:
             min_count: Minimum number of messages required to be eligible
         """
         self.min_messages = max(0, min_count)
+        self._summary_cache = None
     
-    def set_blacklist(self, blacklisted_usernames: List[str]) -> None:
+    def set_blacklist(self, blacklisted_usernames: Iterable[str]) -> None:
         """
         Set list of blacklisted usernames.
         
         Args:
-            blacklisted_usernames: List of usernames to exclude
-        """
-        # Convert to lowercase for case-insensitive matching
-        self.blacklist = {username.lower().strip() for username in blacklisted_usernames if username.strip()}
+            blacklisted_usernames: Usernames to exclude (surrounding whitespace
+                and blank entries are ignored)
+        """
+        # Normalize for case-insensitive matching, stripping each entry once
+        blacklist = {normalize_username(name) for username in blacklisted_usernames
+                     if (name := username.strip())}
+        if blacklist != self.blacklist:
+            self.blacklist = blacklist
+            self._summary_cache = None
     
     def apply_filters(self, participants: Dict[str, Participant]) -> List[str]:
         """
@@ -55,13 +82,20 @@ class ParticipantFilter:
         Returns:
             List of usernames that pass all filters
         """
-        eligible = []
+        # Bind filter state once; same checks as _is_eligible, cheapest first
+        blacklist = self.blacklist
+        min_messages = self.min_messages
+        keyword_re = self._keyword_re
         
-        for username, participant in participants.items():
-            if self._is_eligible(participant):
-                eligible.append(username)
+        if keyword_re is None:
+            return [username for username, participant in participants.items()
+                    if participant.username_key not in blacklist
+                    and participant.message_count >= min_messages]
         
-        return eligible
+        return [username for username, participant in participants.items()
+                if participant.username_key not in blacklist
+                and participant.message_count >= min_messages
+                and keyword_re.search(participant.joined_messages)]
     
     def _is_eligible(self, participant: Participant) -> bool:
         """
@@ -73,44 +107,72 @@ class ParticipantFilter:
         Returns:
             True if participant is eligible, False otherwise
         """
+        return self._evaluate(participant, stop_at_first=True) == 0
+    
+    def _evaluate(self, participant: Participant, stop_at_first: bool = False) -> int:
+        """
+        Evaluate all filter criteria for a participant.
+        
+        Cheap checks run first; the keyword scan is skipped when stop_at_first
+        is set and the participant has already failed.
+        
+        Args:
+            participant: Participant object to check
+            stop_at_first: Return as soon as any criterion fails
+            
+        Returns:
+            Bitmask of failed criteria (REASON_* flags), 0 if eligible
+        """
+        failed = 0
+        
         # Check blacklist (case-insensitive)
-        if participant.username.lower() in self.blacklist:
-            return False
+        if participant.username_key in self.blacklist:
+            failed |= self.REASON_BLACKLISTED
         
         # Check minimum message count
         if participant.message_count < self.min_messages:
-            return False
+            failed |= self.REASON_TOO_FEW_MESSAGES
+        
+        if failed and stop_at_first:
+            return failed
         
         # Check keyword filter (if set)
-        if self.keyword:
-            has_keyword = False
-            search_keyword = self.keyword if self.case_sensitive else self.keyword.lower()
-            
-            for message in participant.messages:
-                search_message = message if self.case_sensitive else message.lower()
-                if search_keyword in search_message:
-                    has_keyword = True
-                    break
-            
-            if not has_keyword:
-                return False
+        if self._keyword_re and not self._has_keyword(participant):
+            failed |= self.REASON_NO_KEYWORD
+        
+        return failed
+    
+    def _has_keyword(self, participant: Participant) -> bool:
+        """
+        Check if any of a participant's messages contain the keyword.
         
-        return True
+        Args:
+            participant: Participant object to check
+            
+        Returns:
+            True if the keyword appears in at least one message
+        """
+        return self._keyword_re.search(participant.joined_messages) is not None
     
     def get_filter_summary(self) -> Dict[str, Any]:
         """
         Get a summary of current filter settings.
         
+        The summary is cached until one of the setters is called, so callers
+        should treat the returned dictionary as read-only.
+        
         Returns:
             Dictionary with current filter settings
         """
-        return {
-            "keyword": self.keyword,
-            "case_sensitive": self.case_sensitive,
-            "min_messages": self.min_messages,
-            "blacklist_count": len(self.blacklist),
-            "blacklisted_users": list(self.blacklist)
-        }
+        if self._summary_cache is None:
+            self._summary_cache = {
+                "keyword": self.keyword,
+                "case_sensitive": self.case_sensitive,
+                "min_messages": self.min_messages,
+                "blacklist_count": len(self.blacklist),
+                "blacklisted_users": list(self.blacklist)
+            }
+        return self._summary_cache
     
     def is_participant_eligible(self, participant: Participant) -> bool:
         """
@@ -135,24 +197,15 @@ class ParticipantFilter:
             List of string reasons for ineligibility
         """
         reasons = []
+        failed = self._evaluate(participant)
         
-        if participant.username.lower() in self.blacklist:
+        if failed & self.REASON_BLACKLISTED:
             reasons.append("Username is blacklisted")
         
-        if participant.message_count < self.min_messages:
+        if failed & self.REASON_TOO_FEW_MESSAGES:
             reasons.append(f"Message count ({participant.message_count}) below minimum ({self.min_messages})")
         
-        if self.keyword:
-            has_keyword = False
-            search_keyword = self.keyword if self.case_sensitive else self.keyword.lower()
-            
-            for message in participant.messages:
-                search_message = message if self.case_sensitive else message.lower()
-                if search_keyword in search_message:
-                    has_keyword = True
-                    break
-            
-            if not has_keyword:
-                reasons.append(f"No messages contain required keyword: '{self.keyword}'")
+        if failed & self.REASON_NO_KEYWORD:
+            reasons.append(f"No messages contain required keyword: '{self.keyword}'")
         
         return reasons
@@ -2,6 +2,7 @@
 YouTube Chat Giveaway Application
 Main entry point for the desktop application.
 """
+import os
 import sys
 import tkinter as tk
 from pathlib import Path
@@ -29,16 +30,26 @@ def main():
         # Create and run application
         app = YouTubeGiveawayApp(root)
         
-        # Center window on screen
-        root.update_idletasks()
-        width = root.winfo_width()
-        height = root.winfo_height()
-        x = (root.winfo_screenwidth() // 2) - (width // 2)
-        y = (root.winfo_screenheight() // 2) - (height // 2)
-        root.geometry(f'{width}x{height}+{x}+{y}')
+        # Center window on screen from the mainloop's first idle pass instead
+        # of forcing an update_idletasks() drain before the loop starts. The
+        # window may not be mapped yet (winfo_width() would still be 1), so
+        # use the size the app configured
+        def center_window():
+            width = YouTubeGiveawayApp.WINDOW_WIDTH
+            height = YouTubeGiveawayApp.WINDOW_HEIGHT
+            x = (root.winfo_screenwidth() // 2) - (width // 2)
+            y = (root.winfo_screenheight() // 2) - (height // 2)
+            root.geometry(f'{width}x{height}+{x}+{y}')
         
-        # Start the application
-        root.mainloop()
+        root.after_idle(center_window)
+        
+        # Start the application (optionally under cProfile, e.g. to find out
+        # where time goes while filtering a large live chat)
+        profile_path = os.environ.get('GIVEAWAY_PROFILE')
+        if profile_path:
+            run_profiled(root, profile_path)
+        else:
+            root.mainloop()
         
     except KeyboardInterrupt:
         print("\nApplication interrupted by user")
@@ -50,5 +61,25 @@ def main():
         sys.exit(1)
 
 
+def run_profiled(root: tk.Tk, profile_path: str) -> None:
+    """
+    Run the Tk main loop under cProfile and save the stats when it exits.
+    
+    Args:
+        root: Root tkinter window
+        profile_path: File to write the cProfile stats to
+    """
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(root.mainloop)
+    finally:
+        profiler.dump_stats(profile_path)
+        print(f"Profile saved to {profile_path}")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+
+
 if __name__ == "__main__":
     main()
@@ -1,59 +1,117 @@
 """
 Data models for the YouTube Chat Giveaway application.
 """
-from dataclasses import dataclass
+import sys
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable
 
 
-@dataclass
+def normalize_username(username: str) -> str:
+    """
+    Get the case-insensitive key for a username.
+    
+    Uses casefold() (so e.g. "ß" matches "ss") and interns the result, so
+    every message from the same user shares one key string.
+    
+    Args:
+        username: Username as displayed
+        
+    Returns:
+        Normalized username key
+    """
+    return sys.intern(username.casefold())
+
+
+@dataclass(slots=True)
 class Participant:
     """Represents a participant in the giveaway."""
     username: str
     message_count: int = 0
-    messages: List[str] = None
-    first_seen: datetime = None
+    messages: List[str] = field(default_factory=list)
+    first_seen_ns: int = field(default_factory=time.time_ns)  # Epoch nanoseconds
+    username_key: str = field(default="", init=False, repr=False, compare=False)
+    has_keyword: bool = field(default=False, init=False, compare=False)
+    _keyword: str = field(default="", init=False, repr=False, compare=False)
+    _joined_messages: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        if self.messages is None:
-            self.messages = []
-        if self.first_seen is None:
-            self.first_seen = datetime.now()
+        self.username_key = normalize_username(self.username)
     
     def add_message(self, message: str) -> None:
         """Add a message to this participant's message list."""
         self.messages.append(message)
         self.message_count += 1
+        self._joined_messages = None
+        if self._keyword and not self.has_keyword:
+            self.has_keyword = self._keyword in message.lower()
+    
+    def extend_messages(self, messages: Iterable[str]) -> None:
+        """
+        Add several messages at once (e.g. when merging participants).
+        
+        Args:
+            messages: Messages to append in order
+        """
+        if not isinstance(messages, list):
+            messages = list(messages)
+        if not messages:
+            return
+        self.messages.extend(messages)
+        self.message_count += len(messages)
+        self._joined_messages = None
+        if self._keyword and not self.has_keyword:
+            keyword = self._keyword
+            self.has_keyword = any(keyword in message.lower() for message in messages)
+    
+    def set_keyword(self, keyword: str) -> None:
+        """
+        Track a keyword (case-insensitive) and update has_keyword.
+        
+        Existing messages are scanned only when the keyword changes; after
+        that, add_message keeps has_keyword current incrementally.
+        
+        Args:
+            keyword: Keyword to track, or empty string to stop tracking
+        """
+        keyword = keyword.lower()
+        if keyword == self._keyword:
+            return
+        self._keyword = keyword
+        self.has_keyword = bool(keyword) and any(keyword in message.lower() for message in self.messages)
+    
+    @property
+    def first_seen(self) -> datetime:
+        """When this participant was first seen, as a local datetime."""
+        return datetime.fromtimestamp(self.first_seen_ns / 1e9)
+    
+    @property
+    def joined_messages(self) -> str:
+        """All messages joined by newlines, cached until the next add_message."""
+        if self._joined_messages is None:
+            self._joined_messages = "\n".join(self.messages)
+        return self._joined_messages
 
 
-@dataclass
+@dataclass(slots=True)
 class Winner:
     """Represents a selected winner."""
     username: str
     draw_order: int
-    timestamp: datetime = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    username_key: str = field(default="", init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+        self.username_key = normalize_username(self.username)
 
 
-@dataclass
+@dataclass(slots=True)
 class GiveawaySession:
     """Represents a complete giveaway session."""
     youtube_video_id: Optional[str] = None
     mode: str = "offline"  # "live" or "offline"
-    participants: Dict[str, Participant] = None
-    winners: List[Winner] = None
-    filters_applied: Dict = None
-    timestamp_created: datetime = None
-    
-    def __post_init__(self):
-        if self.participants is None:
-            self.participants = {}
-        if self.winners is None:
-            self.winners = []
-        if self.filters_applied is None:
-            self.filters_applied = {}
-        if self.timestamp_created is None:
-            self.timestamp_created = datetime.now()
+    participants: Dict[str, Participant] = field(default_factory=dict)
+    winners: List[Winner] = field(default_factory=list)
+    filters_applied: Dict = field(default_factory=dict)
+    timestamp_created: datetime = field(default_factory=datetime.now)
@@ -3,6 +3,9 @@ OAuth 2.0 authentication handler for YouTube Data API.
 """
 import os
 import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 from google.auth.transport.requests import Request
@@ -10,12 +13,40 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
 
+# Static text shown in the Auth Setup dialog
+SETUP_INSTRUCTIONS = """
+YouTube API OAuth Setup Instructions:
+
+1. Go to Google Cloud Console (https://console.cloud.google.com/)
+2. Create a new project or select existing project
+3. Enable the YouTube Data API v3
+4. Go to 'Credentials' and create OAuth 2.0 Client ID
+5. Select 'Desktop Application' as application type
+6. Download the credentials JSON file
+7. Save it as 'client_secret.json' in the application directory
+8. Run the application and click 'Authenticate' to complete setup
+
+Required file: client_secret.json
+Token file (auto-generated): token.json
+
+Scopes required:
+- https://www.googleapis.com/auth/youtube.readonly
+""".strip()
+
+
 class YouTubeOAuth:
     """Handles OAuth 2.0 authentication for YouTube Data API."""
     
     # YouTube Data API scope for read-only access
     SCOPES = ['https://www.googleapis.com/auth/youtube.readonly']
     
+    # Refresh tokens in the background this long before they expire
+    REFRESH_MARGIN = timedelta(minutes=5)
+    # get_credentials returns a cached token without refreshing if it has this long left
+    MIN_TOKEN_VALIDITY = timedelta(seconds=60)
+    # get_auth_status results are reused for this many seconds
+    AUTH_STATUS_TTL = 2.0
+    
     def __init__(self, credentials_file: str = 'client_secret.json', 
                  token_file: str = 'token.json'):
         """
@@ -28,22 +59,67 @@ class YouTubeOAuth:
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.credentials = None
+        self._creds_path = Path(credentials_file)
+        self._token_path = Path(token_file)
+        
+        # Parsed token file, reused until the file's mtime changes
+        self._creds_cache: Optional[Credentials] = None
+        self._token_mtime: Optional[float] = None
+        self._has_credentials_file = False
+        
+        # Last get_auth_status result and the time.monotonic() it was built at
+        self._status_cache: Optional[dict] = None
+        self._status_time = 0.0
+        
+        # Keep an existing token fresh off the UI thread. The lock guards the
+        # timer and generation, which change on both the caller's and the
+        # timer's thread; a timer whose generation is stale must not save
+        self._refresh_lock = threading.RLock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._refresh_generation = 0
+        try:
+            self._schedule_refresh(self._load_creds_cached())
+        except Exception:
+            pass  # Invalid token file; get_credentials deals with it
     
     def has_credentials_file(self) -> bool:
         """Check if client credentials file exists."""
-        return Path(self.credentials_file).exists()
+        # Only a positive result is remembered, so a file added later is still found
+        if not self._has_credentials_file:
+            self._has_credentials_file = self._creds_path.is_file()
+        return self._has_credentials_file
     
     def has_valid_token(self) -> bool:
         """Check if a valid token file exists."""
-        if not Path(self.token_file).exists():
-            return False
-        
         try:
-            creds = Credentials.from_authorized_user_file(self.token_file, self.SCOPES)
-            return creds and creds.valid
+            creds = self._load_creds_cached()
+            return bool(creds and creds.valid)
         except Exception:
             return False
     
+    def _load_creds_cached(self) -> Optional[Credentials]:
+        """
+        Load credentials from the token file, reparsing only when it changes.
+        
+        Returns:
+            Credentials object, or None if there is no token file
+            
+        Raises:
+            Exception: If the token file cannot be parsed
+        """
+        try:
+            mtime = os.stat(self.token_file).st_mtime
+        except OSError:
+            self._creds_cache = None
+            self._token_mtime = None
+            return None
+        
+        if mtime != self._token_mtime:
+            self._creds_cache = Credentials.from_authorized_user_file(self.token_file, self.SCOPES)
+            self._token_mtime = mtime
+        
+        return self._creds_cache
+    
     def get_credentials(self) -> Optional[Credentials]:
         """
         Get valid credentials, refreshing or re-authenticating as needed.
@@ -54,9 +130,9 @@ class YouTubeOAuth:
         creds = None
         
         # Load existing token if available
-        if Path(self.token_file).exists():
+        if self._token_path.is_file():
             try:
-                creds = Credentials.from_authorized_user_file(self.token_file, self.SCOPES)
+                creds = self._load_creds_cached()
             except Exception as e:
                 print(f"Error loading token file: {e}")
                 # Delete invalid token file
@@ -65,6 +141,12 @@ class YouTubeOAuth:
                 except:
                     pass
         
+        # Token still good for a while (kept fresh by the background refresh)
+        if creds and creds.valid and (
+                creds.expiry is None or creds.expiry - self._utcnow() > self.MIN_TOKEN_VALIDITY):
+            self.credentials = creds
+            return creds
+        
         # If credentials are not valid, refresh or re-authenticate
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
@@ -84,12 +166,72 @@ class YouTubeOAuth:
             try:
                 self._save_credentials(creds)
                 self.credentials = creds
+                self._schedule_refresh(creds)
                 return creds
             except Exception as e:
                 print(f"Error saving credentials: {e}")
         
         return None
     
+    @staticmethod
+    def _utcnow() -> datetime:
+        """Current time as a naive UTC datetime, matching Credentials.expiry."""
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    
+    def _schedule_refresh(self, creds: Optional[Credentials]) -> None:
+        """
+        Schedule a background refresh shortly before the token expires.
+        
+        Args:
+            creds: Credentials to keep fresh (ignored if they can't be refreshed)
+        """
+        with self._refresh_lock:
+            self._cancel_refresh()
+            if not creds or not creds.refresh_token or not creds.expiry:
+                return
+            
+            delay = (creds.expiry - self._utcnow() - self.REFRESH_MARGIN).total_seconds()
+            self._refresh_timer = threading.Timer(max(0, delay), self._background_refresh,
+                                                  args=(creds, self._refresh_generation))
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+    
+    def _cancel_refresh(self) -> None:
+        """Cancel any scheduled background refresh, including one already running."""
+        with self._refresh_lock:
+            # A callback that has already started sees the new generation and gives up
+            self._refresh_generation += 1
+            if self._refresh_timer:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+    
+    def _background_refresh(self, creds: Credentials, generation: int) -> None:
+        """
+        Refresh and save credentials (runs on a timer thread).
+        
+        Args:
+            creds: Credentials to refresh
+            generation: Value of _refresh_generation when this refresh was scheduled
+        """
+        try:
+            creds.refresh(Request())
+        except Exception as e:
+            # get_credentials falls back to refreshing inline
+            print(f"Error refreshing token in background: {e}")
+            return
+        
+        with self._refresh_lock:
+            if generation != self._refresh_generation:
+                return  # Revoked or rescheduled while the refresh was in flight
+            
+            try:
+                self._save_credentials(creds)
+            except Exception as e:
+                print(f"Error refreshing token in background: {e}")
+                return
+            
+            self._schedule_refresh(creds)
+    
     def _authenticate(self) -> Optional[Credentials]:
         """
         Perform OAuth 2.0 authentication flow.
@@ -124,6 +266,7 @@ class YouTubeOAuth:
         Args:
             creds: Credentials object to save
         """
+        self._status_cache = None
         try:
             with open(self.token_file, 'w') as token:
                 token.write(creds.to_json())
@@ -139,6 +282,9 @@ class YouTubeOAuth:
             True if successful, False otherwise
         """
         try:
+            self._cancel_refresh()
+            self._status_cache = None
+            
             # Revoke the credentials if possible
             if self.credentials and self.credentials.valid:
                 try:
@@ -147,7 +293,7 @@ class YouTubeOAuth:
                     print(f"Error revoking credentials: {e}")
             
             # Delete token file
-            if Path(self.token_file).exists():
+            if self._token_path.is_file():
                 os.remove(self.token_file)
             
             self.credentials = None
@@ -161,12 +307,29 @@ class YouTubeOAuth:
         """
         Get detailed authentication status.
         
+        Returns:
+            Dictionary with authentication status information
+        """
+        # Polling status widgets would otherwise hit the filesystem every call
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_time < self.AUTH_STATUS_TTL:
+            return dict(self._status_cache)
+        
+        status = self._build_auth_status()
+        self._status_cache = status
+        self._status_time = now
+        return dict(status)
+    
+    def _build_auth_status(self) -> dict:
+        """
+        Check the credential and token files for get_auth_status.
+        
         Returns:
             Dictionary with authentication status information
         """
         status = {
             'has_credentials_file': self.has_credentials_file(),
-            'has_token_file': Path(self.token_file).exists(),
+            'has_token_file': self._token_path.is_file(),
             'has_valid_token': False,
             'is_authenticated': False,
             'user_info': None,
@@ -179,7 +342,7 @@ class YouTubeOAuth:
         
         try:
             if status['has_token_file']:
-                creds = Credentials.from_authorized_user_file(self.token_file, self.SCOPES)
+                creds = self._load_creds_cached()
                 if creds and creds.valid:
                     status['has_valid_token'] = True
                     status['is_authenticated'] = True
@@ -212,21 +375,4 @@ class YouTubeOAuth:
         Returns:
             Formatted setup instructions
         """
-        return """
-YouTube API OAuth Setup Instructions:
-
-1. Go to Google Cloud Console (https://console.cloud.google.com/)
-2. Create a new project or select existing project
-3. Enable the YouTube Data API v3
-4. Go to 'Credentials' and create OAuth 2.0 Client ID
-5. Select 'Desktop Application' as application type
-6. Download the credentials JSON file
-7. Save it as 'client_secret.json' in the application directory
-8. Run the application and click 'Authenticate' to complete setup
-
-Required file: client_secret.json
-Token file (auto-generated): token.json
-
-Scopes required:
-- https://www.googleapis.com/auth/youtube.readonly
-        """.strip()
+        return SETUP_INSTRUCTIONS
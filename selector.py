@@ -1,11 +1,16 @@
 """
 Random selection logic for picking giveaway winners.
 """
+import heapq
+import math
 import random
 from typing import List, Dict
 from datetime import datetime
 from models import Winner
 
+# Weighted draws over at least this many users use numpy when it is installed
+NUMPY_MIN_CANDIDATES = 10000
+
 
 class WinnerSelector:
     """Handles the random selection of winners from eligible participants."""
@@ -13,8 +18,8 @@ class WinnerSelector:
     def __init__(self, seed: int = None):
         """Initialize the selector with an optional random seed for reproducibility."""
         self.seed = seed
-        if seed is not None:
-            random.seed(seed)
+        # Own RNG instance so seeding doesn't touch the global random module state
+        self._rng = random.Random(seed)
     
     def pick_winners(self, eligible_usernames: List[str], num_winners: int, 
                     weighted_by_messages: bool = False, 
@@ -48,15 +53,16 @@ class WinnerSelector:
             )
         else:
             # Simple random selection without replacement
-            selected_usernames = random.sample(eligible_usernames, num_winners)
+            selected_usernames = self._rng.sample(eligible_usernames, num_winners)
         
         # Create Winner objects with draw order
+        draw_time = datetime.now()
         winners = []
         for i, username in enumerate(selected_usernames, 1):
             winners.append(Winner(
                 username=username,
                 draw_order=i,
-                timestamp=datetime.now()
+                timestamp=draw_time
             ))
         
         return winners
@@ -74,33 +80,67 @@ class WinnerSelector:
         Returns:
             List of selected usernames
         """
-        # Create weights list corresponding to usernames
-        weights = [message_counts.get(username, 1) for username in usernames]
+        # Large draws: compute all the keys in one vectorized pass if available
+        if len(usernames) >= NUMPY_MIN_CANDIDATES:
+            try:
+                return self._weighted_selection_numpy(usernames, num_winners, message_counts)
+            except ImportError:
+                pass  # numpy missing; use the pure Python version
         
-        # Use random.choices for weighted selection without replacement
-        selected = []
-        remaining_usernames = usernames.copy()
-        remaining_weights = weights.copy()
+        # Efraimidis-Spirakis A-Res: give each user the key u^(1/w) and take the
+        # k largest; compared in log space (log(u)/w) to avoid underflow.
+        # Zero-weight users all get -inf and are only drawn once every other
+        # user has won; the random second key orders them among themselves
+        keys = []
+        rand = self._rng.random
+        for username in usernames:
+            weight = message_counts.get(username, 1)
+            # 1 - random() lies in (0, 1], so log() is always defined
+            key = math.log(1.0 - rand()) / weight if weight > 0 else -math.inf
+            keys.append((key, rand(), username))
         
-        for _ in range(num_winners):
-            if not remaining_usernames:
-                break
-                
-            # Weighted random choice
-            chosen_username = random.choices(
-                remaining_usernames, 
-                weights=remaining_weights, 
-                k=1
-            )[0]
-            
-            # Add to selected and remove from remaining
-            selected.append(chosen_username)
-            idx = remaining_usernames.index(chosen_username)
-            remaining_usernames.pop(idx)
-            remaining_weights.pop(idx)
+        selected = [username for _, _, username in heapq.nlargest(num_winners, keys)]
         
         return selected
     
+    def _weighted_selection_numpy(self, usernames: List[str], num_winners: int,
+                                  message_counts: Dict[str, int]) -> List[str]:
+        """
+        Perform the A-Res weighted selection with numpy (optional dependency).
+        
+        Args:
+            usernames: List of eligible usernames
+            num_winners: Number of winners to select
+            message_counts: Dict mapping username to message count
+            
+        Returns:
+            List of selected usernames
+            
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        import numpy as np
+        
+        weights = np.fromiter((message_counts.get(username, 1) for username in usernames),
+                              dtype=np.float64, count=len(usernames))
+        
+        # Seeded from our RNG so a fixed seed still gives a reproducible draw
+        rng = np.random.default_rng(self._rng.getrandbits(64))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            keys = np.where(weights > 0, np.log(1.0 - rng.random(len(usernames))) / weights, -np.inf)
+        
+        # Take the k largest keys without sorting everything, then order them
+        top = np.argpartition(-keys, num_winners - 1)[:num_winners]
+        top = top[np.argsort(-keys[top], kind='stable')]
+        
+        # Zero-weight users tie at -inf; fill any remaining places from them at random
+        num_positive = int(np.count_nonzero(weights > 0))
+        if num_winners > num_positive:
+            zero_weight = rng.permutation(np.flatnonzero(weights <= 0))
+            top = np.concatenate([top[:num_positive], zero_weight[:num_winners - num_positive]])
+        
+        return [usernames[i] for i in top]
+    
     def get_seed(self) -> int:
         """Get the current random seed for reproducibility."""
         return self.seed
@@ -108,4 +148,4 @@ class WinnerSelector:
     def set_seed(self, seed: int) -> None:
         """Set a new random seed."""
         self.seed = seed
-        random.seed(seed)
+        self._rng.seed(seed)
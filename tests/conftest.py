@@ -0,0 +1,17 @@
+"""
+Shared pytest configuration for the component tests.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Application modules live at the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def sample_dir() -> Path:
+    """Directory containing the bundled sample chat files."""
+    return REPO_ROOT
@@ -0,0 +1,710 @@
+"""
+Component tests for the core giveaway logic (no GUI required).
+Run with: python -m pytest tests
+"""
+import csv
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from models import Participant, Winner
+from filters import ParticipantFilter
+from selector import WinnerSelector
+from file_parser import DataParser
+from exporter import DataExporter
+from url_extractor import YouTubeURLExtractor
+from youtube_api import YouTubeAPI, _OrjsonModel, _parse_published_at, _response_model
+from datasource import DataSourceManager
+from oauth import YouTubeOAuth
+
+
+def test_file_parsing(sample_dir):
+    """Test file parsing functionality."""
+    parser = DataParser()
+    
+    # Test sample CSV
+    participants = parser.parse_file(str(sample_dir / "sample_chat.csv"))
+    assert len(participants) == 14
+    assert all(participant.message_count == len(participant.messages)
+               for participant in participants.values())
+    
+    # Test sample TXT
+    participants = parser.parse_file(str(sample_dir / "sample_chat.txt"))
+    assert len(participants) == 10
+
+
+def _participant_data(participants):
+    """Comparable view of parsed participants (first_seen differs between parses)."""
+    return {key: (participant.username, participant.message_count, participant.messages)
+            for key, participant in participants.items()}
+
+
+def test_csv_parsing_with_pandas(sample_dir, tmp_path, monkeypatch):
+    """Test that the pandas CSV path gives the same participants as the csv module."""
+    pytest.importorskip("pandas")
+    import file_parser
+    
+    edge_case_path = tmp_path / "edge_cases.csv"
+    edge_case_path.write_text(
+        'user,message,extra\n'
+        'Alice,"hello, world",x\n'
+        'ALICE, giveaway ,y\n'
+        'Bob,,z\n'
+        'Short\n'
+        ' ,no author,w\n'
+        'Zoë,ünïcode 🎁,v\n',
+        encoding='utf-8')
+    
+    parser = DataParser()
+    expected = {path: _participant_data(parser.parse_file(str(path)))
+                for path in (sample_dir / "sample_chat.csv", edge_case_path)}
+    
+    # Record that the pandas path ran rather than falling back to the csv module
+    calls = []
+    parse_csv_pandas = DataParser._parse_csv_pandas
+    
+    def spy(self, *args, **kwargs):
+        result = parse_csv_pandas(self, *args, **kwargs)
+        calls.append(args)
+        return result
+    
+    monkeypatch.setattr(file_parser, "PANDAS_MIN_FILE_SIZE", 0)
+    monkeypatch.setattr(DataParser, "_parse_csv_pandas", spy)
+    for path, participants in expected.items():
+        assert _participant_data(parser.parse_file(str(path))) == participants
+    assert len(calls) == len(expected)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("buffer_size", [1, 2, 5, 1 << 20])
+def test_txt_line_endings(sample_dir, tmp_path, monkeypatch, newline, buffer_size):
+    """Test that TXT files parse the same with any line ending style, as in text mode."""
+    import file_parser
+    
+    with open(sample_dir / "sample_chat.txt", encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    expected = _participant_data(DataParser().parse_file(str(sample_dir / "sample_chat.txt")))
+    
+    path = tmp_path / "chat.txt"
+    path.write_bytes(newline.join(lines).encode('utf-8'))
+    # Tiny reads put line endings (and the two halves of \r\n) at block boundaries
+    monkeypatch.setattr(file_parser, "READ_BUFFER_SIZE", buffer_size)
+    assert _participant_data(DataParser().parse_file(str(path))) == expected
+
+
+def test_filtering():
+    """Test participant filtering."""
+    # Create test participants
+    participants = {
+        "user1": Participant("User1", message_count=3, messages=["hello", "giveaway", "win"]),
+        "user2": Participant("User2", message_count=1, messages=["hi"]),
+        "user3": Participant("User3", message_count=2, messages=["giveaway", "cool"]),
+        "spammer": Participant("Spammer", message_count=10, messages=["spam"] * 10),
+    }
+    
+    filter_obj = ParticipantFilter()
+    
+    # Test no filters
+    assert len(filter_obj.apply_filters(participants)) == 4
+    
+    # Test keyword filter
+    filter_obj.set_keyword_filter("giveaway")
+    assert sorted(filter_obj.apply_filters(participants)) == ["user1", "user3"]
+    
+    # Test minimum messages
+    filter_obj.set_keyword_filter("")  # Clear keyword
+    filter_obj.set_minimum_messages(2)
+    assert sorted(filter_obj.apply_filters(participants)) == ["spammer", "user1", "user3"]
+    
+    # Test blacklist
+    filter_obj.set_minimum_messages(1)  # Reset
+    filter_obj.set_blacklist(["spammer"])
+    assert "spammer" not in filter_obj.apply_filters(participants)
+    assert len(filter_obj.apply_filters(participants)) == 3
+
+
+def test_winner_selection():
+    """Test winner selection."""
+    eligible_usernames = ["user1", "user2", "user3", "user4", "user5"]
+    selector = WinnerSelector(seed=42)  # Use seed for reproducible results
+    
+    # Test normal selection
+    winners = selector.pick_winners(eligible_usernames, 3)
+    assert [winner.draw_order for winner in winners] == [1, 2, 3]
+    assert len({winner.username for winner in winners}) == 3
+    assert all(winner.username in eligible_usernames for winner in winners)
+    
+    # Test error case - too many winners
+    with pytest.raises(ValueError):
+        selector.pick_winners(eligible_usernames, 10)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_weighted_selection(monkeypatch, use_numpy):
+    """Test weighted selection (A-Res) in both the pure Python and numpy paths."""
+    import selector as selector_module
+    if use_numpy:
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(selector_module, "NUMPY_MIN_CANDIDATES", 0)
+    else:
+        monkeypatch.setattr(selector_module, "NUMPY_MIN_CANDIDATES", float("inf"))
+    
+    selector = WinnerSelector(seed=7)
+    counts = {"user1": 1, "user2": 3, "user3": 2, "user4": 1, "user5": 5}
+    eligible_usernames = list(counts)
+    
+    # Distinct winners, as many as asked for
+    for num_winners in range(1, len(eligible_usernames) + 1):
+        winners = selector.pick_winners(eligible_usernames, num_winners, True, counts)
+        assert [winner.draw_order for winner in winners] == list(range(1, num_winners + 1))
+        assert len({winner.username for winner in winners}) == num_winners
+    
+    # First pick follows the weights: user2 should win ~3/4 of the time
+    trials = 4000
+    wins = sum(selector.pick_winners(["user1", "user2"], 1, True, counts)[0].username == "user2"
+               for _ in range(trials))
+    assert abs(wins / trials - 0.75) < 0.03
+    
+    # Zero-weight users come last, in random order among themselves
+    zero_counts = {"a": 5, "b": 0, "c": 0, "d": 0}
+    orders = set()
+    for _ in range(50):
+        winners = selector.pick_winners(list(zero_counts), 3, True, zero_counts)
+        names = [winner.username for winner in winners]
+        assert names[0] == "a"
+        assert len(set(names)) == 3
+        orders.add(tuple(names))
+    assert len(orders) > 1
+
+
+def test_csv_export(tmp_path):
+    """Test CSV export functionality."""
+    # Create test data
+    participants = {
+        "user1": Participant("User1", message_count=3),
+        "user2": Participant("User2", message_count=1),
+        "user3": Participant("User3", message_count=2),
+    }
+    
+    winners = [
+        Winner("User1", 1),
+        Winner("User3", 2),
+    ]
+    
+    exporter = DataExporter()
+    
+    # Test winners export
+    winners_path = tmp_path / "test_winners.csv"
+    assert exporter.export_winners(winners, str(winners_path))
+    with open(winners_path, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    assert len(rows) == 3  # Header + 2 winners
+    
+    # Test all participants export
+    all_path = tmp_path / "test_all.csv"
+    eligible = ["user1", "user3"]
+    assert exporter.export_all_participants(
+        participants, winners, str(all_path),
+        eligible_usernames=eligible
+    )
+    with open(all_path, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['username'] for row in rows] == ["User1", "User2", "User3"]
+    assert [row['selected_as_winner'] for row in rows] == ["True", "False", "True"]
+
+
+def test_csv_export_keyword(tmp_path):
+    """Test that keyword_used follows the filter's keyword matching."""
+    participants = {
+        "user1": Participant("User1", message_count=1, messages=["I want the GIVEAWAY"]),
+        "user2": Participant("User2", message_count=1, messages=["hello"]),
+        "user3": Participant("User3", message_count=1, messages=["giveaway please"]),
+    }
+    exporter = DataExporter()
+    path = tmp_path / "keyword.csv"
+    
+    def keyword_column(**kwargs):
+        assert exporter.export_all_participants(participants, [], str(path), **kwargs)
+        with open(path, newline='', encoding='utf-8') as file:
+            return [row['keyword_used'] for row in csv.DictReader(file)]
+    
+    # Summary only: case-insensitive by default, no prior set_keyword needed
+    assert keyword_column(filter_summary={'keyword': 'giveaway'}) == ["True", "False", "True"]
+    assert keyword_column(filter_summary={'keyword': ''}) == ["False", "False", "False"]
+    
+    # A case-sensitive filter is honoured
+    filter_obj = ParticipantFilter()
+    filter_obj.set_keyword_filter("GIVEAWAY", case_sensitive=True)
+    assert keyword_column(filter_summary=filter_obj.get_filter_summary(),
+                          participant_filter=filter_obj) == ["True", "False", "False"]
+    assert keyword_column(filter_summary=filter_obj.get_filter_summary()) == ["True", "False", "False"]
+
+
+def _write_rows_in_thread(path, rows):
+    """Run DataExporter._write_rows with a timeout; returns the exception it raised."""
+    import threading
+    
+    raised = []
+    
+    def run():
+        try:
+            DataExporter()._write_rows(str(path), rows)
+        except Exception as e:
+            raised.append(e)
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive(), "_write_rows did not return"
+    return raised[0] if raised else None
+
+
+class _Unprintable:
+    """CSV cell whose str() fails, so csv.writer raises in the writer thread."""
+    
+    def __str__(self):
+        raise ValueError("bad cell")
+
+
+def test_export_writer_error(tmp_path, monkeypatch):
+    """Test that a failure in the writer thread reaches the caller without hanging."""
+    import exporter
+    # Tiny chunks and queue so the producer would block if the writer stopped draining
+    monkeypatch.setattr(exporter, "EXPORT_CHUNK_ROWS", 1)
+    monkeypatch.setattr(exporter, "EXPORT_QUEUE_CHUNKS", 1)
+    
+    rows = [["ok"], [_Unprintable()]] + [["more"]] * 1000
+    error = _write_rows_in_thread(tmp_path / "writer_error.csv", iter(rows))
+    assert isinstance(error, ValueError)
+
+
+def test_export_row_generator_error(tmp_path, monkeypatch):
+    """Test that an error raised while producing rows reaches the caller without hanging."""
+    import exporter
+    monkeypatch.setattr(exporter, "EXPORT_CHUNK_ROWS", 1)
+    monkeypatch.setattr(exporter, "EXPORT_QUEUE_CHUNKS", 1)
+    
+    def rows():
+        for i in range(100):
+            yield [i]
+        raise RuntimeError("row source failed")
+    
+    error = _write_rows_in_thread(tmp_path / "producer_error.csv", rows())
+    assert isinstance(error, RuntimeError)
+
+
+def test_url_extraction():
+    """Test URL-only mode functionality."""
+    extractor = YouTubeURLExtractor()
+    
+    # Test URL validation
+    test_urls = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "dQw4w9WgXcQ",
+    ]
+    
+    for url in test_urls:
+        assert extractor.extract_video_id(url) == "dQw4w9WgXcQ"
+    
+    assert extractor.extract_video_id("https://example.com/watch") is None
+    
+    # Test demo participant generation
+    demo_info = {"title": "Test Video", "channel": "Test Channel"}
+    participants = extractor.generate_demo_participants(demo_info, 10)
+    assert len(participants) == 10
+    assert all(participant.message_count >= 1 for participant in participants.values())
+
+
+class _ChunkedResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+    
+    def __init__(self, body: bytes, chunk_size: int):
+        self.status_code = 200
+        self.encoding = 'utf-8'
+        self.body = body
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+    
+    def iter_content(self, chunk_size=1):
+        # Ignore the requested size so markers and characters straddle chunks
+        for start in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[start:start + self.chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+    
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+def test_streamed_video_info(chunk_size):
+    """Test that reading a video page in chunks gives the same info as the whole page."""
+    settled = (
+        '<html><head><title>Gïveaway 🎁 ñight - YouTube</title></head>'
+        '<script>{"ownerChannelName":"Chännel ✓","isLiveContent":true,'
+        '"liveChatRenderer":{}}</script>'
+        + 'ü' * 500 + '"title":"Other"</html>'
+    )
+    pages = [
+        settled,
+        # No chat marker, so the whole page has to be read
+        '<title>Plain – video</title>"author":"Fällback"' + 'é' * 200 + '"isLive":true',
+        # Channel only available from a later fallback, title tag empty
+        '<title> - YouTube</title>"ownerChannelName":"YouTube"<meta property="og:title" '
+        'content="Méta 😀">"hasLiveChat":true LIVE</span>"author":"Äuthor"',
+    ]
+    
+    for page in pages:
+        extractor = YouTubeURLExtractor()
+        response = _ChunkedResponse(page.encode('utf-8'), chunk_size)
+        extractor.session.get = lambda *args, **kwargs: response
+        
+        success, info = extractor.get_video_info("dQw4w9WgXcQ")
+        assert success
+        assert info["title"] == extractor._extract_title(page)
+        assert info["channel"] == extractor._extract_channel(page)
+        assert info["is_live"] == extractor._check_if_live(page)
+        assert info["has_chat"] == extractor._check_has_chat(page)
+        
+        if page is settled:
+            assert info["title"] == "Gïveaway 🎁 ñight"
+            assert info["channel"] == "Chännel ✓"
+            assert response.bytes_read < len(response.body)  # Stopped early
+
+
+def test_parse_published_at():
+    """Test conversion of API publishedAt timestamps to epoch nanoseconds."""
+    noon_ns = 1704110400 * 10**9  # 2024-01-01T12:00:00Z
+    assert _parse_published_at("2024-01-01T12:00:00Z") == noon_ns
+    assert _parse_published_at("2024-01-01T12:00:00.123Z") == noon_ns + 123_000_000
+    assert _parse_published_at("2024-01-01T12:00:00.123456Z") == noon_ns + 123_456_000
+    assert _parse_published_at("2024-01-01T14:00:00.000001+02:00") == noon_ns + 1000
+    
+    for bad in ("", "not a date", "2024-13-01T00:00:00Z"):
+        assert _parse_published_at(bad) is None
+
+
+def test_live_first_seen():
+    """Test that live participants are first seen when their first message was posted."""
+    api = YouTubeAPI(oauth_handler=None)
+    messages = [
+        {"username": "Alice", "message": "hi", "timestamp_ns": 1_000},
+        {"username": "ALICE", "message": "again", "timestamp_ns": 2_000},
+        {"username": "Bob", "message": "hello", "timestamp_ns": None},  # Unparseable publishedAt
+    ]
+    participants = {}
+    assert api.process_chat_messages(messages, participants) == 3
+    
+    assert participants["alice"].first_seen_ns == 1_000
+    assert participants["alice"].message_count == 2
+    assert participants["bob"].first_seen_ns > 1_000  # Batch processing time
+
+
+class _FakeLiveAPI:
+    """Stand-in for YouTubeAPI that replays scripted (batch, polling interval) results."""
+    
+    def __init__(self, manager, results, fetch_time=0.0):
+        self.manager = manager
+        self.results = list(results)
+        self.fetch_time = fetch_time
+        self.poll_interval = 0.0
+        self.last_message_time = None
+    
+    def get_next_poll_delay(self):
+        return 0.0
+    
+    def get_polling_interval(self):
+        return self.poll_interval
+    
+    def fetch_live_chat_messages(self):
+        time.sleep(self.fetch_time)
+        if not self.results:
+            self.manager.stop_event.set()  # Script finished
+            return True, [], None
+        
+        batch, self.poll_interval = self.results.pop(0)
+        if batch == "error":
+            return False, [], "quota exceeded"
+        if batch:
+            self.last_message_time = time.monotonic()
+        return True, batch, None
+    
+    def process_chat_messages(self, messages, participants, keyword=""):
+        return YouTubeAPI(oauth_handler=None).process_chat_messages(messages, participants, keyword)
+    
+    def reset_chat_session(self):
+        pass
+
+
+def _chat_batch(username):
+    return [{"username": username, "message": "hi", "timestamp_ns": None}]
+
+
+def test_live_fetch_backoff(monkeypatch):
+    """Test idle and error backoff of the live fetch loop and their caps."""
+    manager = DataSourceManager()
+    errors = []
+    manager.set_callbacks(on_error=errors.append)
+    delays = []
+    monkeypatch.setattr(manager, "_wait_for_next_poll", delays.append)
+    
+    results = [([], 5.0)] * 12 + [(_chat_batch("Alice"), 5.0)] + [("error", 5.0)] * 5
+    manager.youtube_api = _FakeLiveAPI(manager, results)
+    manager._live_fetch_loop()
+    
+    # Idle polls back off by half the interval each time up to the cap; a
+    # message resets to the API's interval; errors double until the loop gives up
+    idle = [min(5.0 * (1 + 0.5 * streak), DataSourceManager.MAX_IDLE_POLL_INTERVAL)
+            for streak in range(12)]
+    assert idle[-1] == DataSourceManager.MAX_IDLE_POLL_INTERVAL
+    assert delays == idle + [5.0, 2, 4, 8, 16]
+    assert manager.fetch_errors == 5
+    assert "Too many consecutive errors" in errors[-1]
+    
+    manager._err_streak = 10
+    assert manager._error_delay() == DataSourceManager.MAX_ERROR_BACKOFF
+
+
+def test_live_fetch_notify_coalescing():
+    """Test that live updates are coalesced to at most one per NOTIFY_MIN_INTERVAL."""
+    manager = DataSourceManager()
+    notify_times = []
+    manager.set_callbacks(on_participants_updated=lambda: notify_times.append(time.monotonic()),
+                          on_status_changed=lambda status: None)
+    
+    # Fast polls (interval 0) with new messages every fetch, then an idle poll
+    # with a long interval while the last update is still pending
+    results = [(_chat_batch(f"user{i}"), 0.0) for i in range(60)] + [([], 0.5)]
+    api = manager.youtube_api = _FakeLiveAPI(manager, results, fetch_time=0.005)
+    start = time.monotonic()
+    manager._live_fetch_loop()
+    elapsed = time.monotonic() - start
+    
+    assert len(manager.participants) == 60
+    interval = DataSourceManager.NOTIFY_MIN_INTERVAL
+    assert 2 <= len(notify_times) <= elapsed / interval + 2
+    gaps = [later - earlier for earlier, later in zip(notify_times, notify_times[1:])]
+    assert all(gap >= interval * 0.9 for gap in gaps)
+    
+    # The pending update went out during the idle wait, not at the next poll
+    assert 0 <= notify_times[-1] - api.last_message_time < 0.3
+
+
+@pytest.fixture
+def stub_credentials(monkeypatch):
+    """Replace google's Credentials in oauth with a stub that records token file parses."""
+    import oauth
+    
+    class StubCredentials:
+        parsed = []  # Token of every parsed token file, in order
+        
+        def __init__(self, token, expiry=None, refresh_token=None):
+            self.token = token
+            self.expiry = expiry
+            self.refresh_token = refresh_token
+            self.valid = True
+            self.expired = False
+            self.on_refresh = None
+        
+        @classmethod
+        def from_authorized_user_file(cls, path, scopes):
+            with open(path) as file:
+                token = json.load(file)["token"]
+            cls.parsed.append(token)
+            return cls(token)
+        
+        def refresh(self, request):
+            if self.on_refresh:
+                self.on_refresh()
+            self.token = "refreshed"
+        
+        def to_json(self):
+            return json.dumps({"token": self.token})
+    
+    monkeypatch.setattr(oauth, "Credentials", StubCredentials)
+    monkeypatch.setattr(oauth, "Request", lambda: None)
+    return StubCredentials
+
+
+def test_oauth_token_cache(tmp_path, stub_credentials):
+    """Test that the token file is parsed once and again only after it changes."""
+    token_path = tmp_path / "token.json"
+    token_path.write_text('{"token": "first"}')
+    handler = YouTubeOAuth(str(tmp_path / "client_secret.json"), str(token_path))
+    
+    assert handler.has_valid_token()
+    assert handler.has_valid_token()
+    assert stub_credentials.parsed == ["first"]
+    
+    # Rewrite with a newer mtime (filesystem timestamps can be coarse)
+    token_path.write_text('{"token": "second"}')
+    stat = token_path.stat()
+    os.utime(token_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert handler._load_creds_cached().token == "second"
+    assert stub_credentials.parsed == ["first", "second"]
+    
+    token_path.unlink()
+    assert handler._load_creds_cached() is None
+
+
+def test_oauth_background_refresh_after_revoke(tmp_path, stub_credentials):
+    """Test that a background refresh saves and reschedules, unless revoked meanwhile."""
+    token_path = tmp_path / "token.json"
+    handler = YouTubeOAuth(str(tmp_path / "client_secret.json"), str(token_path))
+    creds = stub_credentials("old", expiry=YouTubeOAuth._utcnow() + timedelta(hours=1),
+                             refresh_token="refresh")
+    
+    def scheduled_generation():
+        # Schedule, then stop the timer itself and run its callback by hand
+        handler._schedule_refresh(creds)
+        handler._refresh_timer.cancel()
+        return handler._refresh_generation
+    
+    handler._background_refresh(creds, scheduled_generation())
+    assert json.loads(token_path.read_text())["token"] == "refreshed"
+    assert handler._refresh_timer is not None  # Next refresh scheduled
+    handler._cancel_refresh()
+    
+    # Revoke while the refresh request is in flight
+    token_path.unlink()
+    started, release = threading.Event(), threading.Event()
+    creds.on_refresh = lambda: (started.set(), release.wait(5))
+    refresh = threading.Thread(target=handler._background_refresh, args=(creds, scheduled_generation()))
+    refresh.start()
+    assert started.wait(5)
+    assert handler.revoke_credentials()
+    release.set()
+    refresh.join(5)
+    
+    assert not token_path.exists()
+    assert handler._refresh_timer is None
+
+
+def test_oauth_auth_status_cache(tmp_path, stub_credentials, monkeypatch):
+    """Test that get_auth_status is reused for AUTH_STATUS_TTL and rebuilt when credentials change."""
+    (tmp_path / "client_secret.json").write_text("{}")
+    handler = YouTubeOAuth(str(tmp_path / "client_secret.json"), str(tmp_path / "token.json"))
+    
+    builds = []
+    build_auth_status = handler._build_auth_status
+    monkeypatch.setattr(handler, "_build_auth_status",
+                        lambda: builds.append(None) or build_auth_status())
+    
+    status = handler.get_auth_status()
+    assert not status['is_authenticated']
+    status['is_authenticated'] = True  # Callers get a copy
+    assert not handler.get_auth_status()['is_authenticated']
+    assert len(builds) == 1
+    
+    # Saving a token invalidates the cached status
+    handler._save_credentials(stub_credentials("token"))
+    assert handler.get_auth_status()['is_authenticated']
+    assert len(builds) == 2
+    
+    # So does revoking, and the TTL running out
+    handler.revoke_credentials()
+    assert not handler.get_auth_status()['has_token_file']
+    handler._status_time -= YouTubeOAuth.AUTH_STATUS_TTL
+    handler.get_auth_status()
+    assert len(builds) == 4
+
+
+class _FakeVideosResource:
+    """Stub of youtube.videos() that records list() calls and answers from a script."""
+    
+    def __init__(self, respond):
+        self.respond = respond  # Called with the list of requested IDs
+        self.requests = []
+    
+    def list(self, part, id):
+        video_ids = id.split(',')
+        self.requests.append(video_ids)
+        respond = self.respond
+        
+        class Request:
+            def execute(self):
+                return respond(video_ids)
+        
+        return Request()
+
+
+def test_get_live_chat_ids():
+    """Test batched live chat ID lookup: chunking, per-chunk errors and missing videos."""
+    from googleapiclient.errors import HttpError
+    import httplib2
+    
+    video_ids = [f"video{i:06d}" for i in range(120)]
+    failing_chunk = set(video_ids[50:100])
+    
+    def respond(requested):
+        if failing_chunk.intersection(requested):
+            response = httplib2.Response({'status': 403})
+            response.reason = 'Forbidden'
+            raise HttpError(response, b'{"error": {"code": 403, "message": "quota", '
+                                      b'"errors": [{"reason": "quotaExceeded"}]}}')
+        items = []
+        for video_id in requested:
+            if video_id == "video000001":
+                continue  # Deleted or private: not in items
+            if video_id == "video000002":
+                items.append({'id': video_id})  # Not a live stream
+            else:
+                items.append({'id': video_id,
+                              'liveStreamingDetails': {'activeLiveChatId': f"chat-{video_id}"}})
+        return {'items': items}
+    
+    api = YouTubeAPI(oauth_handler=None)
+    videos = _FakeVideosResource(respond)
+    api.youtube = type("FakeYouTube", (), {"videos": lambda self: videos})()
+    
+    results = api.get_live_chat_ids(video_ids)
+    
+    assert [len(chunk) for chunk in videos.requests] == [50, 50, 20]
+    assert set(results) == set(video_ids)
+    assert results["video000000"] == (True, "chat-video000000")
+    assert results["video000001"] == (False, "Video not found")
+    assert results["video000002"] == (False, "Video is not a live stream")
+    assert all(results[video_id] == (False, "API error: quotaExceeded") for video_id in failing_chunk)
+    assert results["video000119"] == (True, "chat-video000119")
+    assert api.live_chat_id is None  # Lookup doesn't switch the chat being fetched
+    
+    api.youtube = None
+    assert api.get_live_chat_ids(["video000000"]) == {"video000000": (False, "Not authenticated")}
+
+
+def test_orjson_response_model(monkeypatch):
+    """Test the orjson response model's JsonModel fallback and data wrapper handling."""
+    def rejects_everything(content):
+        raise ValueError("unsupported")  # orjson.JSONDecodeError is a ValueError
+    
+    # Parsed by the given loads, unwrapping "data" only when asked to
+    assert _OrjsonModel(json.loads).deserialize(b'{"data": {"id": 1}}') == {"data": {"id": 1}}
+    wrapped = _OrjsonModel(json.loads, data_wrapper=True)
+    assert wrapped.deserialize(b'{"data": {"id": 1}}') == {"id": 1}
+    assert wrapped.deserialize(b'[{"data": 1}]') == [{"data": 1}]
+    
+    # Anything loads rejects goes through JsonModel instead
+    fallback = _OrjsonModel(rejects_everything, data_wrapper=True)
+    assert fallback.deserialize(b'{"data": {"id": 2}}') == {"id": 2}
+    assert fallback.deserialize(b'not json') == 'not json'
+    
+    # orjson is optional
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert _response_model() is None
+
+
+def test_orjson_response_model_with_orjson():
+    """Test the response model with the real orjson, when installed."""
+    orjson = pytest.importorskip("orjson")
+    model = _response_model()
+    assert isinstance(model, _OrjsonModel)
+    assert model.deserialize(b'{"items": [{"id": "abc"}]}') == {"items": [{"id": "abc"}]}
+    # orjson rejects NaN; the JsonModel fallback parses it
+    assert math.isnan(model.deserialize(b'{"value": NaN}')["value"])
@@ -3,8 +3,10 @@ Main GUI application using tkinter.
 """
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import copy
 import threading
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional
 from datetime import datetime
 from pathlib import Path
 
@@ -20,6 +22,14 @@ from oauth import YouTubeOAuth
 class YouTubeGiveawayApp:
     """Main application class for YouTube Chat Giveaway."""
     
+    # Initial main window size in pixels
+    WINDOW_WIDTH = 1200
+    WINDOW_HEIGHT = 800
+    # Participant updates arriving within this many milliseconds share one refresh
+    REFRESH_DEBOUNCE_MS = 250
+    # Long-lived threads shared by all background button actions
+    BACKGROUND_WORKERS = 3
+    
     def __init__(self, root: tk.Tk):
         """
         Initialize the application.
@@ -29,7 +39,7 @@ class YouTubeGiveawayApp:
         """
         self.root = root
         self.root.title("YouTube Chat Giveaway")
-        self.root.geometry("1200x800")
+        self.root.geometry(f"{self.WINDOW_WIDTH}x{self.WINDOW_HEIGHT}")
         
         # Core components
         self.filter = ParticipantFilter()
@@ -43,11 +53,30 @@ class YouTubeGiveawayApp:
         self.datasource.set_youtube_api(self.youtube_api)
         
         # Application state
-        self.participants: Dict[str, Participant] = {}
+        self.participants: Mapping[str, Participant] = {}
         self.eligible_usernames: List[str] = []
+        # eligible_usernames in display order, rebuilt only when eligibility changes
+        self._sorted_eligible_cache: Optional[List[str]] = None
+        # Message counts of eligible users for weighted draws, built on first pick
+        self._eligible_message_counts: Optional[Dict[str, int]] = None
+        # Lines currently shown in the participants and winners listboxes
+        self._rendered_items: List[str] = []
+        self._rendered_winners: List[str] = []
+        self._rendered_counts: Optional[tuple] = None
         self.winners: List[Winner] = []
         self.current_session = GiveawaySession()
         
+        # Pending debounced refresh scheduled by _on_participants_updated
+        self._refresh_after_id = None
+        
+        # Set while an OAuth flow is waiting on the browser; only touched on the Tk thread
+        self._auth_in_progress = False
+        
+        # Shared pool for background button actions so presses don't each start a new thread
+        self._io_pool = ThreadPoolExecutor(max_workers=self.BACKGROUND_WORKERS,
+                                           thread_name_prefix="yt-io")
+        self._closing = False  # Set by _on_closing; stops tasks reporting to a destroyed root
+        
         # UI variables
         self.youtube_url_var = tk.StringVar()
         self.keyword_var = tk.StringVar()
@@ -60,6 +89,7 @@ class YouTubeGiveawayApp:
         self.participants_listbox = None
         self.winners_listbox = None
         self.blacklist_text = None
+        self._blacklist_loaded = False  # Blacklist text has been passed to the filter
         self.participants_count_label = None
         self.eligible_count_label = None
         
@@ -131,14 +161,14 @@ class YouTubeGiveawayApp:
             self._set_status("Please enter a YouTube URL or video ID")
             return
         
-        def resolve_thread():
+        def resolve_task():
             is_valid, message = self.datasource.url_extractor.validate_url(url)
             if is_valid:
-                self._set_status(f"✓ Valid URL: {message}")
+                self._on_status_changed(f"✓ Valid URL: {message}")
             else:
-                self._set_status(f"✗ Invalid URL: {message}")
+                self._on_status_changed(f"✗ Invalid URL: {message}")
         
-        threading.Thread(target=resolve_thread, daemon=True).start()
+        self._run_in_background(resolve_task)
     
     def _import_from_url(self) -> None:
         """Import participants from YouTube URL (demo mode)."""
@@ -157,9 +187,7 @@ class YouTubeGiveawayApp:
         )
         
         if response:
-            success = self.datasource.import_from_url(url, demo_mode=True)
-            if success:
-                self._apply_filters()  # Auto-apply filters after import
+            self._start_import(self.datasource.import_from_url, url, demo_mode=True)
     
     def _create_main_content(self) -> None:
         """Create the main content area."""
@@ -278,19 +306,19 @@ class YouTubeGiveawayApp:
             if not self._authenticate_youtube():
                 return
         
-        def resolve_thread():
+        def resolve_task():
             video_id = self.youtube_api.extract_video_id(url)
             if not video_id:
-                self._set_status("Invalid YouTube URL or video ID")
+                self._on_status_changed("Invalid YouTube URL or video ID")
                 return
             
             success, result = self.youtube_api.get_live_chat_id(video_id)
             if success:
-                self._set_status(f"Live chat resolved: {result}")
+                self._on_status_changed(f"Live chat resolved: {result}")
             else:
-                self._set_status(f"Failed to resolve live chat: {result}")
+                self._on_status_changed(f"Failed to resolve live chat: {result}")
         
-        threading.Thread(target=resolve_thread, daemon=True).start()
+        self._run_in_background(resolve_task)
     
     def _start_live_fetch(self) -> None:
         """Start live fetching."""
@@ -303,12 +331,23 @@ class YouTubeGiveawayApp:
             if not self._authenticate_youtube():
                 return
         
-        success = self.datasource.start_live_fetch(url)
+        # Resolving the live chat is an API call; keep it off the Tk thread
+        self.start_fetch_btn.config(state=tk.DISABLED)
+        
+        def start_task():
+            success = self.datasource.start_live_fetch(url)
+            self.root.after(0, self._on_live_fetch_started, success)
+        
+        self._run_in_background(start_task)
+    
+    def _on_live_fetch_started(self, success: bool) -> None:
+        """Update the fetch buttons once start_live_fetch has returned."""
         if success:
-            self.start_fetch_btn.config(state=tk.DISABLED)
             self.stop_fetch_btn.config(state=tk.NORMAL)
             self.pick_winners_btn.config(state=tk.DISABLED)
-        
+        else:
+            self.start_fetch_btn.config(state=tk.NORMAL)
+    
     def _stop_live_fetch(self) -> None:
         """Stop live fetching."""
         self.datasource.stop_live_fetch()
@@ -328,35 +367,88 @@ class YouTubeGiveawayApp:
         )
         
         if file_path:
-            success = self.datasource.import_from_file(file_path)
+            self._start_import(self.datasource.import_from_file, file_path)
+    
+    def _start_import(self, import_func, *args, **kwargs) -> None:
+        """
+        Run a data source import in the background so the UI stays responsive.
+        
+        Args:
+            import_func: DataSourceManager import method to call
+            *args, **kwargs: Arguments for import_func
+        """
+        if self.datasource.is_importing:
+            self._set_status("An import is already in progress")
+            return
+        
+        # Set before the task is queued so a second click is rejected immediately
+        self.datasource.is_importing = True
+        
+        def import_task():
+            success = import_func(*args, **kwargs)
             if success:
-                self._apply_filters()  # Auto-apply filters after import
+                self.root.after(0, self._apply_filters)  # Auto-apply filters after import
+        
+        self._run_in_background(import_task)
+    
+    def _run_in_background(self, func, *args, **kwargs) -> None:
+        """
+        Submit a function to the background I/O pool.
+        
+        The function must not touch Tk widgets directly; use root.after to
+        hand results back to the main thread.
+        
+        Args:
+            func: Function to call
+            *args, **kwargs: Arguments for func
+        """
+        if self._closing:
+            return
+        self._io_pool.submit(self._run_task, func, args, kwargs)
+    
+    def _run_task(self, func, args, kwargs) -> None:
+        """Run one background task, reporting failures to the status bar."""
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            print(f"Error in background task: {e}")
+            self._on_error(str(e))
     
     def _clear_all(self) -> None:
         """Clear all participants and reset the application."""
         if messagebox.askyesno("Clear All", "Are you sure you want to clear all participants and winners?"):
             self.datasource.clear_participants()
-            self.participants.clear()
+            self.participants = self.datasource.snapshot_participants()
             self.eligible_usernames.clear()
+            self._sorted_eligible_cache = None
+            self._eligible_message_counts = None
             self.winners.clear()
             self._update_ui()
     
     def _apply_filters(self) -> None:
         """Apply current filters to participants."""
-        # Get current participants
-        self.participants = self.datasource.get_participants()
+        # Get current participants. Always a snapshot: a live fetch or an
+        # import may be starting on another thread and adding participants
+        self.participants = self.datasource.snapshot_participants()
         
         # Update filter settings
         self.filter.set_keyword_filter(self.keyword_var.get())
+        self.datasource.set_keyword(self.filter.keyword)
         self.filter.set_minimum_messages(self.min_messages_var.get())
         
-        # Get blacklist
-        blacklist_text = self.blacklist_text.get(1.0, tk.END).strip()
-        blacklist = [line.strip() for line in blacklist_text.split('\n') if line.strip()]
-        self.filter.set_blacklist(blacklist)
+        # Get blacklist, re-reading the text box only after it has been edited
+        if not self._blacklist_loaded or self.blacklist_text.edit_modified():
+            blacklist_text = self.blacklist_text.get(1.0, tk.END)
+            self.filter.set_blacklist(blacklist_text.splitlines())  # Strips and normalizes each line
+            self.blacklist_text.edit_modified(False)
+            self._blacklist_loaded = True
         
-        # Apply filters
-        self.eligible_usernames = self.filter.apply_filters(self.participants)
+        # Apply filters (keep the cached display order if nobody joined or left)
+        eligible_usernames = self.filter.apply_filters(self.participants)
+        if eligible_usernames != self.eligible_usernames:
+            self._sorted_eligible_cache = None
+        self.eligible_usernames = eligible_usernames
+        self._eligible_message_counts = None  # Counts may have changed even if eligibility didn't
         
         # Update UI
         self._update_ui()
@@ -381,15 +473,23 @@ class YouTubeGiveawayApp:
             return
         
         try:
-            # Prepare message counts for weighted selection
-            message_counts = {username: self.participants[username.lower()].message_count 
-                            for username in self.eligible_usernames}
+            # Prepare message counts for weighted selection (eligible usernames
+            # are already the lowercase participant keys); reused for repeated
+            # draws until the next filter pass
+            weighted = self.weighted_selection_var.get()
+            message_counts = None
+            if weighted:
+                if self._eligible_message_counts is None:
+                    participants = self.participants
+                    self._eligible_message_counts = {username: participants[username].message_count
+                                                     for username in self.eligible_usernames}
+                message_counts = self._eligible_message_counts
             
             # Pick winners
             self.winners = self.selector.pick_winners(
                 self.eligible_usernames,
                 num_winners,
-                self.weighted_selection_var.get(),
+                weighted,
                 message_counts
             )
             
@@ -417,12 +517,12 @@ class YouTubeGiveawayApp:
         )
         
         if file_path:
-            success = self.exporter.export_winners(self.winners, file_path, self.current_session)
-            if success:
-                self._set_status(f"Winners exported to {file_path}")
-                messagebox.showinfo("Export Successful", f"Winners exported to {file_path}")
-            else:
-                messagebox.showerror("Export Failed", "Failed to export winners")
+            self._start_export(
+                self.exporter.export_winners,
+                (list(self.winners), file_path, self.current_session),
+                f"Winners exported to {file_path}",
+                "Failed to export winners"
+            )
     
     def _export_all(self) -> None:
         """Export all participants to CSV."""
@@ -438,15 +538,42 @@ class YouTubeGiveawayApp:
         
         if file_path:
             filter_summary = self.filter.get_filter_summary()
-            success = self.exporter.export_all_participants(
-                self.participants, self.winners, file_path, 
-                self.current_session, self.eligible_usernames, filter_summary
+            self._start_export(
+                self.exporter.export_all_participants,
+                (self.datasource.snapshot_participants(), list(self.winners), file_path,
+                 self.current_session, list(self.eligible_usernames), filter_summary,
+                 copy.copy(self.filter)),  # Filter edits during the export don't affect it
+                f"All participants exported to {file_path}",
+                "Failed to export participants"
             )
-            if success:
-                self._set_status(f"All participants exported to {file_path}")
-                messagebox.showinfo("Export Successful", f"All participants exported to {file_path}")
-            else:
-                messagebox.showerror("Export Failed", "Failed to export participants")
+    
+    def _start_export(self, export_func, args: tuple, success_message: str,
+                      failure_message: str) -> None:
+        """
+        Write an export in the background so large CSVs don't freeze the UI.
+        
+        Args:
+            export_func: DataExporter method to call
+            args: Arguments for export_func (copies, so later UI changes don't leak in)
+            success_message: Status and dialog text if the export succeeds
+            failure_message: Dialog text if it fails
+        """
+        self._set_status("Exporting...")
+        
+        def export_task():
+            success = export_func(*args)
+            self.root.after(0, self._on_export_done, success, success_message, failure_message)
+        
+        self._run_in_background(export_task)
+    
+    def _on_export_done(self, success: bool, success_message: str, failure_message: str) -> None:
+        """Report the result of a background export."""
+        if success:
+            self._set_status(success_message)
+            messagebox.showinfo("Export Successful", success_message)
+        else:
+            self._set_status(failure_message)
+            messagebox.showerror("Export Failed", failure_message)
     
     def _show_auth_setup(self) -> None:
         """Show authentication setup dialog."""
@@ -519,6 +646,7 @@ Authenticated: {'✓' if auth_status['is_authenticated'] else '✗'}
         def revoke():
             if messagebox.askyesno("Revoke Authentication", "Are you sure you want to revoke authentication?"):
                 self.oauth.revoke_credentials()
+                self.youtube_api.sign_out()
                 self._update_youtube_api_status()
                 auth_window.destroy()
         
@@ -534,25 +662,41 @@ Authenticated: {'✓' if auth_status['is_authenticated'] else '✗'}
                                f"See Auth Setup for detailed instructions.")
             return False
         
+        if self._auth_in_progress:
+            self._set_status("Authentication already in progress - finish it in your browser")
+            return False
+        
+        self._auth_in_progress = True
         self._set_status("Authenticating with YouTube...")
         
-        def auth_thread():
-            success = self.youtube_api.authenticate()
-            if success:
-                # Test connection
-                test_success, test_msg = self.youtube_api.test_api_connection()
-                if test_success:
-                    self._set_status(f"Authentication successful. {test_msg}")
+        def auth_task():
+            try:
+                success = self.youtube_api.authenticate()
+                if success:
+                    # Test connection
+                    test_success, test_msg = self.youtube_api.test_api_connection()
+                    if test_success:
+                        self._on_status_changed(f"Authentication successful. {test_msg}")
+                    else:
+                        self._on_status_changed(f"Authentication completed but test failed: {test_msg}")
                 else:
-                    self._set_status(f"Authentication completed but test failed: {test_msg}")
-            else:
-                self._set_status("Authentication failed")
-            
-            self._update_youtube_api_status()
-        
-        threading.Thread(target=auth_thread, daemon=True).start()
+                    self._on_status_changed("Authentication failed")
+            except Exception as e:
+                print(f"Error during authentication: {e}")
+                self._on_error(str(e))
+            finally:
+                self.root.after(0, self._on_auth_finished)
+        
+        # The consent flow blocks until the browser answers, with no timeout,
+        # so it gets its own thread rather than a shared background worker
+        threading.Thread(target=auth_task, daemon=True).start()
         return True
     
+    def _on_auth_finished(self) -> None:
+        """Allow a new authentication attempt and refresh the API status."""
+        self._auth_in_progress = False
+        self._update_youtube_api_status()
+    
     def _update_youtube_api_status(self) -> None:
         """Update UI based on YouTube API authentication status."""
         if self.youtube_api.is_authenticated():
@@ -568,29 +712,55 @@ Authenticated: {'✓' if auth_status['is_authenticated'] else '✗'}
     
     def _update_participants_display(self) -> None:
         """Update the participants listbox."""
-        self.participants_listbox.delete(0, tk.END)
+        # Build every line first so the listbox is updated with as few Tk calls as possible
+        if self._sorted_eligible_cache is None:
+            self._sorted_eligible_cache = sorted(self.eligible_usernames)
         
-        for username in sorted(self.eligible_usernames):
-            participant = self.participants.get(username.lower())
+        items = []
+        for username in self._sorted_eligible_cache:
+            participant = self.participants.get(username)  # Eligible names are participant keys
             if participant:
-                display_text = f"{participant.username} ({participant.message_count})"
-                self.participants_listbox.insert(tk.END, display_text)
+                items.append(f"{participant.username} ({participant.message_count})")
+        
+        rendered = self._rendered_items
+        if items == rendered:
+            return  # Nothing changed since the last refresh
+        
+        # Keep the unchanged leading rows (and the scroll position over them)
+        # and rewrite only from the first difference onwards
+        start = 0
+        for start, (new, old) in enumerate(zip(items, rendered)):
+            if new != old:
+                break
+        else:
+            start = min(len(items), len(rendered))
+        
+        self.participants_listbox.delete(start, tk.END)
+        if start < len(items):
+            self.participants_listbox.insert(tk.END, *items[start:])
+        self._rendered_items = items
     
     def _update_counts(self) -> None:
         """Update participant counts."""
-        total_count = len(self.participants)
-        eligible_count = len(self.eligible_usernames)
+        counts = (len(self.participants), len(self.eligible_usernames))
+        if counts == self._rendered_counts:
+            return  # Labels already show these numbers
         
+        total_count, eligible_count = counts
         self.participants_count_label.config(text=f"Total: {total_count}")
         self.eligible_count_label.config(text=f"Eligible: {eligible_count}")
+        self._rendered_counts = counts
     
     def _update_winners_display(self) -> None:
         """Update the winners listbox."""
-        self.winners_listbox.delete(0, tk.END)
+        items = [f"{winner.draw_order}. {winner.username}" for winner in self.winners]
+        if items == self._rendered_winners:
+            return  # Every participant refresh lands here; usually nothing changed
         
-        for winner in self.winners:
-            display_text = f"{winner.draw_order}. {winner.username}"
-            self.winners_listbox.insert(tk.END, display_text)
+        self.winners_listbox.delete(0, tk.END)
+        if items:
+            self.winners_listbox.insert(tk.END, *items)
+        self._rendered_winners = items
     
     def _set_status(self, message: str) -> None:
         """Set status bar message."""
@@ -600,22 +770,40 @@ Authenticated: {'✓' if auth_status['is_authenticated'] else '✗'}
     # Callback methods for data source
     def _on_participants_updated(self) -> None:
         """Called when participants are updated from data source."""
-        # Update UI in main thread
-        self.root.after(0, lambda: self._apply_filters())
+        # Update UI in main thread, coalescing bursts of live-fetch pages
+        if self._refresh_after_id is None:
+            self._refresh_after_id = self.root.after(self.REFRESH_DEBOUNCE_MS,
+                                                     self._debounced_refresh)
+    
+    def _debounced_refresh(self) -> None:
+        """Apply filters once for all participant updates since the last refresh."""
+        self._refresh_after_id = None
+        self._apply_filters()
     
     def _on_status_changed(self, status: str) -> None:
         """Called when status changes from data source."""
-        self.root.after(0, lambda: self._set_status(status))
+        if not self._closing:
+            self.root.after(0, self._set_status, status)
     
     def _on_error(self, error: str) -> None:
         """Called when error occurs in data source."""
-        self.root.after(0, lambda: self._set_status(f"Error: {error}"))
+        if not self._closing:
+            self.root.after(0, self._set_status, f"Error: {error}")
     
     def _on_closing(self) -> None:
         """Handle application closing."""
         # Stop any live fetching
         self.datasource.stop_live_fetch()
         
+        # Drop any refresh still waiting to run
+        if self._refresh_after_id is not None:
+            self.root.after_cancel(self._refresh_after_id)
+            self._refresh_after_id = None
+        
+        # Drop queued background work; tasks already running finish on their own
+        self._closing = True
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        
         # Clean up resources
         self.datasource.cleanup()
         
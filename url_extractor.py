@@ -2,22 +2,187 @@
 URL-based data extraction for YouTube videos without API access.
 This module provides functionality to work with YouTube URLs directly.
 """
+import codecs
+import random
 import re
+import threading
+import time
+from functools import lru_cache
 import requests
-from typing import Optional, Dict, List, Tuple
-from datetime import datetime
-from models import Participant
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Pattern, Tuple
+from models import Participant, normalize_username
+
+# Bare video ID (11 characters, alphanumeric + _ -)
+_VIDEO_ID_RE = re.compile(r'^[a-zA-Z0-9_-]{11}$')
+
+# Supported YouTube URL formats (regex for the part before the video ID).
+# Live chat exists only on these, so youtube_api passes LIVE_VIDEO_URL_FORMATS
+LIVE_VIDEO_URL_FORMATS = (
+    r'youtube\.com/watch\?v=',
+    r'youtu\.be/',
+    r'youtube\.com/live/',
+    r'youtube\.com/embed/',
+)
+VIDEO_URL_FORMATS = LIVE_VIDEO_URL_FORMATS + (r'youtube\.com/shorts/',)
+
+# Video pages are downloaded in chunks of this size so reading can stop early
+PAGE_CHUNK_SIZE = 64 * 1024
+
+# Video page metadata. Most fields sit between a literal prefix and the next
+# quote, found with str.find; (prefix, allow_empty) pairs are tried in order
+_TITLE_TAG_RE = re.compile(r'<title>([^<]+)</title>')
+_TITLE_PREFIXES = (
+    ('"title":"', False),
+    ('<meta property="og:title" content="', True),
+)
+_CHANNEL_PREFIXES = (
+    ('"ownerChannelName":"', False),
+    ('"author":"', False),
+    ('<meta property="og:video:tag" content="', True),
+)
+
+# Literal markers for a live video and for one with chat enabled
+_LIVE_MARKERS = (
+    '"isLiveContent":true',
+    '"isLive":true',
+    'LIVE</span>',
+    'live-stream',
+    '"broadcastStatus":"LIVE"',
+)
+_CHAT_MARKERS = (
+    'live_chat',
+    'liveChatRenderer',
+    'chatFrame',
+    '"hasLiveChat":true',
+)
+
+# Chunk scans restart this far back so a marker split across chunks is found
+_MARKER_OVERLAP = max(map(len, _LIVE_MARKERS + _CHAT_MARKERS)) - 1
+
+# Sample data for URL-only demo mode
+_DEMO_USERNAMES = (
+    "ChatFan2024", "StreamViewer", "GiveawayHunter", "LiveWatcher",
+    "YouTubeFan", "StreamLover", "ChatMaster", "ViewerPro",
+    "LiveChatUser", "StreamSupporter", "YouTubeViewer", "ChatBuddy",
+    "StreamingFan", "LiveViewer", "ChatExpert", "StreamWatcher",
+    "YouTubeExplorer", "LiveStreamFan", "ChatEnthusiast", "ViewerElite",
+    "StreamAddict", "ChatChampion", "LiveBroadcastFan", "StreamingPro",
+    "YouTubeRegular", "ChatStar", "LiveContentFan", "StreamFollower"
+)
+
+_DEMO_MESSAGES = (
+    "Great stream!", "Love this content!", "Keep it up!",
+    "Amazing video!", "This is awesome!", "Thanks for streaming!",
+    "Best channel ever!", "Loving the content!", "Great work!",
+    "This is so cool!", "Fantastic stream!", "Really enjoying this!",
+    "Awesome content!", "Love watching this!", "Great job!",
+    "This is amazing!", "Best stream ever!", "Really good content!",
+    "Love this channel!", "Great video!", "This is fun!",
+    "Enjoying the stream!", "Really cool!", "Love it!",
+    "This is great!", "Amazing work!", "Best content!"
+)
+
+_GIVEAWAY_MESSAGES = (
+    "I want to win!", "Count me in!", "Pick me!", "Hope I win!",
+    "Entering the giveaway!", "This is exciting!", "I'm participating!",
+    "Thanks for the giveaway!", "Fingers crossed!", "Let's go!",
+    "I'm in!", "Hope to win something!", "Giveaway time!",
+    "Really want to win!", "Participating!", "This is awesome!",
+    "Count me in for the giveaway!", "Hoping to be chosen!",
+    "Giveaway entry!", "Want to participate!", "Let me win!"
+)
+
+
+def _find_quoted_value(html_content: str, prefix: str, allow_empty: bool) -> Optional[str]:
+    """
+    Find the text between the first usable occurrence of prefix and the next quote.
+    
+    Args:
+        html_content: Page HTML to search
+        prefix: Literal text that ends in an opening quote
+        allow_empty: Accept an empty value instead of trying the next occurrence
+        
+    Returns:
+        The value, or None if the prefix never appears with a closing quote after it
+    """
+    start = html_content.find(prefix)
+    while start != -1:
+        start += len(prefix)
+        end = html_content.find('"', start)
+        if end == -1:
+            return None
+        if end > start or allow_empty:
+            return html_content[start:end]
+        start = html_content.find(prefix, start)
+    
+    return None
+
+
+def _contains_any(html_content: str, markers: Tuple[str, ...], start: int = 0) -> bool:
+    """Check if any of the literal markers occurs in html_content[start:]."""
+    return any(html_content.find(marker, start) != -1 for marker in markers)
+
+
+@lru_cache(maxsize=None)
+def _video_url_re(formats: Tuple[str, ...]) -> Pattern:
+    """Compile the URL formats into one pattern, so a URL is matched in a single scan."""
+    return re.compile(f"(?:{'|'.join(formats)})([a-zA-Z0-9_-]{{11}})")
+
+
+@lru_cache(maxsize=32)
+def extract_video_id(url_or_id: str, formats: Tuple[str, ...] = VIDEO_URL_FORMATS) -> Optional[str]:
+    """
+    Extract a video ID from a YouTube URL, or return it if already an ID.
+    
+    Memoized, since every button re-checks the same URL.
+    
+    Args:
+        url_or_id: YouTube URL or video ID
+        formats: URL formats to accept (see VIDEO_URL_FORMATS)
+        
+    Returns:
+        Video ID if valid, None otherwise
+    """
+    # If it's already a video ID (11 characters, alphanumeric + _ -); the
+    # length test rejects URLs without running the regex
+    if len(url_or_id) == 11 and _VIDEO_ID_RE.match(url_or_id):
+        return url_or_id
+    
+    # Extract from various YouTube URL formats
+    match = _video_url_re(formats).search(url_or_id)
+    return match.group(1) if match else None
 
 
 class YouTubeURLExtractor:
     """Handles YouTube URL processing without API requirements."""
     
+    # Successful video lookups are reused for this many seconds
+    VIDEO_INFO_TTL = 60
+    # Most video lookups kept at once (oldest dropped first)
+    VIDEO_INFO_CACHE_SIZE = 256
+    
     def __init__(self):
         """Initialize the URL extractor."""
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        # Reuse kept-alive connections and retry transient failures with backoff.
+        # Once retries run out, the last response is returned (not raised) so
+        # it is still reported as "HTTP <status>"
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # video_id -> (time.monotonic() when fetched, video info)
+        self._video_info_cache: Dict[str, Tuple[float, Dict]] = {}
+        # Lookups run on several background workers at once
+        self._video_info_lock = threading.Lock()
     
     def extract_video_id(self, url_or_id: str) -> Optional[str]:
         """
@@ -29,29 +194,44 @@ class YouTubeURLExtractor:
         Returns:
             Video ID if valid, None otherwise
         """
-        # If it's already a video ID (11 characters, alphanumeric + _ -)
-        if re.match(r'^[a-zA-Z0-9_-]{11}$', url_or_id):
-            return url_or_id
-        
-        # Extract from various YouTube URL formats
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/live/([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/shorts/([a-zA-Z0-9_-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url_or_id)
-            if match:
-                return match.group(1)
-        
-        return None
+        return extract_video_id(url_or_id)
     
     def get_video_info(self, video_id: str) -> Tuple[bool, Dict]:
         """
         Get basic video information without API.
         
+        Lookups that succeeded within the last VIDEO_INFO_TTL seconds are
+        answered from a cache instead of downloading the page again.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Tuple of (success, video_info_dict)
+        """
+        now = time.monotonic()
+        with self._video_info_lock:
+            cached = self._video_info_cache.get(video_id)
+        if cached and now - cached[0] < self.VIDEO_INFO_TTL:
+            return True, dict(cached[1])
+        
+        # Download outside the lock so other lookups aren't held up
+        success, info = self._fetch_video_info(video_id)
+        if success:
+            with self._video_info_lock:
+                cache = self._video_info_cache
+                cache.pop(video_id, None)  # Re-insert so it counts as newest
+                cache[video_id] = (now, info)
+                if len(cache) > self.VIDEO_INFO_CACHE_SIZE:
+                    del cache[next(iter(cache))]
+            info = dict(info)
+        
+        return success, info
+    
+    def _fetch_video_info(self, video_id: str) -> Tuple[bool, Dict]:
+        """
+        Download a video page and extract its basic information.
+        
         Args:
             video_id: YouTube video ID
             
@@ -60,12 +240,14 @@ class YouTubeURLExtractor:
         """
         try:
             url = f"https://www.youtube.com/watch?v={video_id}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code != 200:
-                return False, {"error": f"HTTP {response.status_code}"}
-            
-            html_content = response.text
+            response = self.session.get(url, timeout=10, stream=True)
+            try:
+                if response.status_code != 200:
+                    return False, {"error": f"HTTP {response.status_code}"}
+                
+                html_content = self._read_page(response)
+            finally:
+                response.close()  # Also drops the rest of the page if we stopped early
             
             # Extract basic info from HTML
             info = {
@@ -82,19 +264,58 @@ class YouTubeURLExtractor:
         except Exception as e:
             return False, {"error": str(e)}
     
+    def _read_page(self, response: requests.Response) -> str:
+        """
+        Download and decode a video page, stopping once the metadata is settled.
+        
+        Reading stops early only when every field has its first-choice value
+        (title tag, ownerChannelName, a live marker and a chat marker), so the
+        result is the same as parsing the whole page.
+        
+        Args:
+            response: Streamed response for the video page
+            
+        Returns:
+            Page HTML (possibly truncated)
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        html_content = ''
+        is_live = has_chat = False
+        for chunk in response.iter_content(chunk_size=PAGE_CHUNK_SIZE):
+            # Look for the markers only in the new text, so each part of the
+            # page is scanned once rather than again for every chunk
+            scan_from = max(0, len(html_content) - _MARKER_OVERLAP)
+            html_content += decoder.decode(chunk)
+            is_live = is_live or _contains_any(html_content, _LIVE_MARKERS, scan_from)
+            has_chat = has_chat or _contains_any(html_content, _CHAT_MARKERS, scan_from)
+            
+            if is_live and has_chat and self._has_final_title_and_channel(html_content):
+                return html_content
+        
+        return html_content + decoder.decode(b'', final=True)
+    
+    def _has_final_title_and_channel(self, html_content: str) -> bool:
+        """Check if the page so far already has its first-choice title and channel."""
+        match = _TITLE_TAG_RE.search(html_content)
+        if not match or not match.group(1).replace(' - YouTube', '').strip():
+            return False
+        
+        prefix, allow_empty = _CHANNEL_PREFIXES[0]
+        channel = _find_quoted_value(html_content, prefix, allow_empty)
+        return bool(channel) and channel != "YouTube"
+    
     def _extract_title(self, html_content: str) -> str:
         """Extract video title from HTML."""
-        patterns = [
-            r'<title>([^<]+)</title>',
-            r'"title":"([^"]+)"',
-            r'<meta property="og:title" content="([^"]*)"'
-        ]
+        match = _TITLE_TAG_RE.search(html_content)
+        if match:
+            # Clean up title
+            title = match.group(1).replace(' - YouTube', '').strip()
+            if title:
+                return title
         
-        for pattern in patterns:
-            match = re.search(pattern, html_content)
-            if match:
-                title = match.group(1)
-                # Clean up title
+        for prefix, allow_empty in _TITLE_PREFIXES:
+            title = _find_quoted_value(html_content, prefix, allow_empty)
+            if title is not None:
                 title = title.replace(' - YouTube', '').strip()
                 if title:
                     return title
@@ -103,43 +324,20 @@ class YouTubeURLExtractor:
     
     def _extract_channel(self, html_content: str) -> str:
         """Extract channel name from HTML."""
-        patterns = [
-            r'"ownerChannelName":"([^"]+)"',
-            r'"author":"([^"]+)"',
-            r'<meta property="og:video:tag" content="([^"]*)"'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, html_content)
-            if match:
-                channel = match.group(1)
-                if channel and channel != "YouTube":
-                    return channel
+        for prefix, allow_empty in _CHANNEL_PREFIXES:
+            channel = _find_quoted_value(html_content, prefix, allow_empty)
+            if channel and channel != "YouTube":
+                return channel
         
         return "Unknown Channel"
     
     def _check_if_live(self, html_content: str) -> bool:
         """Check if video is currently live."""
-        live_indicators = [
-            '"isLiveContent":true',
-            '"isLive":true',
-            'LIVE</span>',
-            'live-stream',
-            '"broadcastStatus":"LIVE"'
-        ]
-        
-        return any(indicator in html_content for indicator in live_indicators)
+        return _contains_any(html_content, _LIVE_MARKERS)
     
     def _check_has_chat(self, html_content: str) -> bool:
         """Check if video has chat enabled."""
-        chat_indicators = [
-            'live_chat',
-            'liveChatRenderer',
-            'chatFrame',
-            '"hasLiveChat":true'
-        ]
-        
-        return any(indicator in html_content for indicator in chat_indicators)
+        return _contains_any(html_content, _CHAT_MARKERS)
     
     def generate_demo_participants(self, video_info: Dict, count: int = 20) -> Dict[str, Participant]:
         """
@@ -153,63 +351,30 @@ class YouTubeURLExtractor:
         Returns:
             Dictionary of demo participants
         """
-        demo_usernames = [
-            "ChatFan2024", "StreamViewer", "GiveawayHunter", "LiveWatcher",
-            "YouTubeFan", "StreamLover", "ChatMaster", "ViewerPro",
-            "LiveChatUser", "StreamSupporter", "YouTubeViewer", "ChatBuddy",
-            "StreamingFan", "LiveViewer", "ChatExpert", "StreamWatcher",
-            "YouTubeExplorer", "LiveStreamFan", "ChatEnthusiast", "ViewerElite",
-            "StreamAddict", "ChatChampion", "LiveBroadcastFan", "StreamingPro",
-            "YouTubeRegular", "ChatStar", "LiveContentFan", "StreamFollower"
-        ]
-        
-        demo_messages = [
-            "Great stream!", "Love this content!", "Keep it up!",
-            "Amazing video!", "This is awesome!", "Thanks for streaming!",
-            "Best channel ever!", "Loving the content!", "Great work!",
-            "This is so cool!", "Fantastic stream!", "Really enjoying this!",
-            "Awesome content!", "Love watching this!", "Great job!",
-            "This is amazing!", "Best stream ever!", "Really good content!",
-            "Love this channel!", "Great video!", "This is fun!",
-            "Enjoying the stream!", "Really cool!", "Love it!",
-            "This is great!", "Amazing work!", "Best content!"
-        ]
-        
-        giveaway_messages = [
-            "I want to win!", "Count me in!", "Pick me!", "Hope I win!",
-            "Entering the giveaway!", "This is exciting!", "I'm participating!",
-            "Thanks for the giveaway!", "Fingers crossed!", "Let's go!",
-            "I'm in!", "Hope to win something!", "Giveaway time!",
-            "Really want to win!", "Participating!", "This is awesome!",
-            "Count me in for the giveaway!", "Hoping to be chosen!",
-            "Giveaway entry!", "Want to participate!", "Let me win!"
-        ]
-        
         participants = {}
         
         # Use a subset of demo usernames
-        selected_usernames = demo_usernames[:count]
+        selected_usernames = _DEMO_USERNAMES[:count]
+        
+        # One fixed-seed generator for consistent demo data without touching
+        # the global random state
+        rng = random.Random(42)
+        start_ns = time.time_ns()  # Shared first_seen for this batch
         
-        for i, username in enumerate(selected_usernames):
-            username_key = username.lower()
+        for username in selected_usernames:
+            username_key = normalize_username(username)
             participant = Participant(
                 username=username,
-                first_seen=datetime.now()
+                first_seen_ns=start_ns
             )
             
             # Generate 1-5 messages per participant
-            import random
-            random.seed(42 + i)  # Consistent randomness
-            num_messages = random.randint(1, 5)
-            
-            for j in range(num_messages):
-                if j == 0 and random.random() < 0.7:  # 70% chance of giveaway message
-                    message = random.choice(giveaway_messages)
-                else:
-                    message = random.choice(demo_messages)
-                
-                participant.add_message(message)
+            num_messages = rng.randint(1, 5)
+            messages = rng.choices(_DEMO_MESSAGES, k=num_messages)
+            if rng.random() < 0.7:  # 70% chance the first message is a giveaway entry
+                messages[0] = rng.choice(_GIVEAWAY_MESSAGES)
             
+            participant.extend_messages(messages)
             participants[username_key] = participant
         
         return participants
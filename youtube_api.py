@@ -1,20 +1,84 @@
 """
 YouTube Data API v3 integration for live chat monitoring.
 """
-import re
 import time
-from typing import Optional, Dict, List, Tuple
 from datetime import datetime
+from typing import Optional, Dict, List, Tuple
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 from google.auth.exceptions import GoogleAuthError
 from oauth import YouTubeOAuth
-from models import Participant
+from models import Participant, normalize_username
+from url_extractor import LIVE_VIDEO_URL_FORMATS, extract_video_id
+
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that decodes API responses with orjson instead of the json module."""
+    
+    def __init__(self, loads, data_wrapper: bool = False):
+        """
+        Initialize the model.
+        
+        Args:
+            loads: orjson.loads
+            data_wrapper: Unwrap a top-level "data" key, as in JsonModel
+        """
+        super().__init__(data_wrapper)
+        self._loads = loads
+    
+    def deserialize(self, content):
+        """Decode a response body, falling back to JsonModel for anything orjson rejects."""
+        try:
+            body = self._loads(content)
+        except ValueError:  # orjson.JSONDecodeError
+            return super().deserialize(content)
+        
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+def _response_model() -> Optional[JsonModel]:
+    """
+    Get the response model for the API client (orjson is an optional dependency).
+    
+    Returns:
+        An orjson-backed model, or None for googleapiclient's default
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    
+    return _OrjsonModel(orjson.loads)
+
+
+def _parse_published_at(published_at: str) -> Optional[int]:
+    """
+    Convert an API publishedAt timestamp to epoch nanoseconds.
+    
+    Args:
+        published_at: ISO 8601 timestamp, e.g. '2024-01-01T12:00:00.123Z'
+        
+    Returns:
+        Epoch nanoseconds, or None if the timestamp can't be parsed
+    """
+    # fromisoformat only accepts a trailing 'Z' from Python 3.11 on
+    if published_at.endswith('Z'):
+        published_at = published_at[:-1] + '+00:00'
+    try:
+        return int(datetime.fromisoformat(published_at).timestamp() * 1_000_000) * 1000
+    except ValueError:
+        return None
 
 
 class YouTubeAPI:
     """Handles YouTube Data API v3 operations for live chat monitoring."""
     
+    # videos.list accepts at most this many comma-separated IDs
+    MAX_IDS_PER_REQUEST = 50
+    
     def __init__(self, oauth_handler: YouTubeOAuth):
         """
         Initialize YouTube API client.
@@ -24,6 +88,7 @@ class YouTubeAPI:
         """
         self.oauth_handler = oauth_handler
         self.youtube = None
+        self._chat_api = None  # youtube.liveChatMessages(), built once per client
         self.live_chat_id = None
         self.next_page_token = None
         self.polling_interval = 3  # seconds
@@ -41,7 +106,9 @@ class YouTubeAPI:
             if not credentials:
                 return False
             
-            self.youtube = build('youtube', 'v3', credentials=credentials)
+            # Live chat polling decodes a response every few seconds; use orjson if available
+            self.youtube = build('youtube', 'v3', credentials=credentials, model=_response_model())
+            self._chat_api = self.youtube.liveChatMessages()
             return True
         except Exception as e:
             print(f"Authentication error: {e}")
@@ -57,23 +124,7 @@ class YouTubeAPI:
         Returns:
             Video ID if valid, None otherwise
         """
-        # If it's already a video ID (11 characters, alphanumeric + _ -)
-        if re.match(r'^[a-zA-Z0-9_-]{11}$', url_or_id):
-            return url_or_id
-        
-        # Extract from various YouTube URL formats
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/live/([a-zA-Z0-9_-]{11})',
-            r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url_or_id)
-            if match:
-                return match.group(1)
-        
-        return None
+        return extract_video_id(url_or_id, LIVE_VIDEO_URL_FORMATS)
     
     def get_live_chat_id(self, video_id: str) -> Tuple[bool, str]:
         """
@@ -98,18 +149,10 @@ class YouTubeAPI:
             if not video_response['items']:
                 return False, "Video not found"
             
-            video = video_response['items'][0]
-            
-            if 'liveStreamingDetails' not in video:
-                return False, "Video is not a live stream"
-            
-            live_details = video['liveStreamingDetails']
-            
-            if 'activeLiveChatId' not in live_details:
-                return False, "Live chat is not available for this stream"
-            
-            self.live_chat_id = live_details['activeLiveChatId']
-            return True, self.live_chat_id
+            success, result = self._live_chat_id_from_video(video_response['items'][0])
+            if success:
+                self.live_chat_id = result
+            return success, result
             
         except HttpError as e:
             error_details = e.error_details[0] if e.error_details else {}
@@ -124,6 +167,67 @@ class YouTubeAPI:
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
     
+    def get_live_chat_ids(self, video_ids: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Get live chat IDs for several videos, up to 50 per API request.
+        
+        Unlike get_live_chat_id, this does not change the chat being fetched.
+        
+        Args:
+            video_ids: YouTube video IDs
+            
+        Returns:
+            Dict mapping each video ID to (success, live_chat_id_or_error_message)
+        """
+        if not self.youtube:
+            return {video_id: (False, "Not authenticated") for video_id in video_ids}
+        
+        results = {}
+        for start in range(0, len(video_ids), self.MAX_IDS_PER_REQUEST):
+            chunk = video_ids[start:start + self.MAX_IDS_PER_REQUEST]
+            try:
+                # videos.list takes a comma-separated id list: one round trip per chunk
+                video_response = self.youtube.videos().list(
+                    part='liveStreamingDetails',
+                    id=','.join(chunk)
+                ).execute()
+            except HttpError as e:
+                error_details = e.error_details[0] if e.error_details else {}
+                error = f"API error: {error_details.get('reason', 'Unknown error')}"
+                results.update((video_id, (False, error)) for video_id in chunk)
+                continue
+            except Exception as e:
+                results.update((video_id, (False, f"Unexpected error: {str(e)}")) for video_id in chunk)
+                continue
+            
+            for video in video_response.get('items', []):
+                results[video['id']] = self._live_chat_id_from_video(video)
+            for video_id in chunk:
+                results.setdefault(video_id, (False, "Video not found"))
+        
+        return results
+    
+    @staticmethod
+    def _live_chat_id_from_video(video: Dict) -> Tuple[bool, str]:
+        """
+        Get the active live chat ID from a videos.list item.
+        
+        Args:
+            video: Video resource with liveStreamingDetails requested
+            
+        Returns:
+            Tuple of (success, live_chat_id_or_error_message)
+        """
+        if 'liveStreamingDetails' not in video:
+            return False, "Video is not a live stream"
+        
+        live_details = video['liveStreamingDetails']
+        
+        if 'activeLiveChatId' not in live_details:
+            return False, "Live chat is not available for this stream"
+        
+        return True, live_details['activeLiveChatId']
+    
     def fetch_live_chat_messages(self) -> Tuple[bool, List[Dict], str]:
         """
         Fetch new live chat messages.
@@ -134,48 +238,30 @@ class YouTubeAPI:
         if not self.youtube or not self.live_chat_id:
             return False, [], "Not properly initialized"
         
+        # Respect polling interval (callers should wait get_next_poll_delay() first);
+        # checked before anything else so a throttled call costs one comparison
+        current_time = time.monotonic()
+        last_poll_time = self.last_poll_time
+        if last_poll_time is not None and current_time - last_poll_time < self.polling_interval:
+            return True, [], "Polling too frequent"
+        
         try:
-            # Respect polling interval
-            current_time = time.time()
-            if self.last_poll_time and (current_time - self.last_poll_time) < self.polling_interval:
-                return True, [], "Polling too frequent"
-            
             # Fetch messages
-            request = self.youtube.liveChatMessages().list(
+            response = self._chat_api.list(
                 liveChatId=self.live_chat_id,
                 part='snippet,authorDetails',
                 pageToken=self.next_page_token
-            )
-            
-            response = request.execute()
+            ).execute()
             
             # Update polling info
             self.next_page_token = response.get('nextPageToken')
             self.polling_interval = response.get('pollingIntervalMillis', 3000) // 1000
             self.last_poll_time = current_time
             
-            # Extract messages
-            messages = []
-            for item in response.get('items', []):
-                snippet = item['snippet']
-                author = item['authorDetails']
-                
-                # Skip system messages and deleted messages
-                if snippet['type'] != 'textMessageEvent':
-                    continue
-                
-                message_data = {
-                    'id': item['id'],
-                    'username': author['displayName'],
-                    'message': snippet['displayMessage'],
-                    'timestamp': snippet['publishedAt'],
-                    'author_channel_id': author.get('channelId'),
-                    'is_verified': author.get('isVerified', False),
-                    'is_chat_owner': author.get('isChatOwner', False),
-                    'is_chat_moderator': author.get('isChatModerator', False),
-                    'is_chat_sponsor': author.get('isChatSponsor', False)
-                }
-                messages.append(message_data)
+            # Extract messages, skipping system messages and deleted messages
+            to_message = self._to_message
+            messages = [to_message(item) for item in response.get('items') or ()
+                        if item['snippet']['type'] == 'textMessageEvent']
             
             return True, messages, ""
             
@@ -196,47 +282,101 @@ class YouTubeAPI:
             return False, [], f"Unexpected error: {str(e)}"
     
     def process_chat_messages(self, messages: List[Dict], 
-                            participants: Dict[str, Participant]) -> int:
+                            participants: Dict[str, Participant],
+                            keyword: str = "") -> int:
         """
         Process chat messages and update participants dictionary.
         
+        New participants' first_seen is the publish time of their first
+        message ('timestamp_ns'), falling back to when the batch was
+        processed if the API timestamp is missing or unparseable.
+        
         Args:
             messages: List of message dictionaries from API
             participants: Dictionary to update with new participants
+            keyword: Keyword new participants track (see Participant.set_keyword)
             
         Returns:
             Number of new messages processed
         """
         new_messages = 0
         
+        # Bind lookups used per message to locals
+        normalize = normalize_username
+        get_participant = participants.get
+        batch_ns = time.time_ns()  # first_seen for messages without a usable timestamp
+        
         for message_data in messages:
             username = message_data['username']
-            message_text = message_data['message']
             
             # Normalize username for deduplication (case-insensitive)
-            username_key = username.lower()
+            username_key = normalize(username)
             
-            # Create participant if doesn't exist
-            if username_key not in participants:
-                participants[username_key] = Participant(
+            # Create participant if doesn't exist (one hash lookup when it does)
+            participant = get_participant(username_key)
+            if participant is None:
+                # First seen when their first message was posted, if known
+                participant = participants[username_key] = Participant(
                     username=username,  # Keep original case
-                    first_seen=datetime.now()
+                    first_seen_ns=message_data.get('timestamp_ns') or batch_ns
                 )
+                participant.set_keyword(keyword)  # No messages yet, so nothing to scan
             
             # Add message
-            participants[username_key].add_message(message_text)
+            participant.add_message(message_data['message'])
             new_messages += 1
         
         return new_messages
     
+    @staticmethod
+    def _to_message(item: Dict) -> Dict:
+        """
+        Convert a liveChatMessages item into a message dictionary.
+        
+        Args:
+            item: Text message item from the API response
+            
+        Returns:
+            Message dictionary as used by process_chat_messages
+        """
+        snippet = item['snippet']
+        author = item['authorDetails']
+        published_at = snippet['publishedAt']
+        
+        return {
+            'id': item['id'],
+            'username': author['displayName'],
+            'message': snippet['displayMessage'],
+            'timestamp': published_at,
+            'timestamp_ns': _parse_published_at(published_at),  # Parsed once here
+            'author_channel_id': author.get('channelId'),
+            'is_verified': author.get('isVerified', False),
+            'is_chat_owner': author.get('isChatOwner', False),
+            'is_chat_moderator': author.get('isChatModerator', False),
+            'is_chat_sponsor': author.get('isChatSponsor', False)
+        }
+    
     def is_authenticated(self) -> bool:
         """Check if API is authenticated and ready."""
+        # The built client doubles as the cached auth flag: no token file I/O here
         return self.youtube is not None
     
+    def sign_out(self) -> None:
+        """Drop the API client after credentials are revoked."""
+        self.youtube = None
+        self._chat_api = None
+        self.reset_chat_session()
+    
     def get_polling_interval(self) -> int:
         """Get current polling interval in seconds."""
         return self.polling_interval
     
+    def get_next_poll_delay(self) -> float:
+        """Get the seconds left before fetch_live_chat_messages may poll again."""
+        if self.last_poll_time is None:
+            return 0.0
+        return max(0.0, self.last_poll_time + self.polling_interval - time.monotonic())
+    
     def reset_chat_session(self) -> None:
         """Reset the chat session (clear tokens and chat ID)."""
         self.live_chat_id = None